@@ -3,6 +3,8 @@ Future Hause — Review CLI
 
 Manually trigger a review for a DraftAgent output.
 This command must be invoked explicitly by a human.
+
+Run from the project root: python -m cli.review --payload <file>
 """
 
 import argparse
@@ -10,11 +12,9 @@ import json
 import sys
 from pathlib import Path
 
-# ✅ FIX: add project root to PYTHONPATH
-PROJECT_ROOT = Path(__file__).resolve().parents[1]
-sys.path.insert(0, str(PROJECT_ROOT))
+import orjson
 
-from engine.review.manual_review import request_review  # noqa: E402
+from engine.review.manual_review import request_review
 
 
 def main():
@@ -31,8 +31,8 @@ def main():
     args = parser.parse_args()
 
     try:
-        with open(args.payload, "r") as f:
-            review_payload = json.load(f)
+        # Bytes straight to the parser: no text-mode decode pass
+        review_payload = orjson.loads(Path(args.payload).read_bytes())
     except Exception as e:
         print(f"[error] Failed to load payload: {e}", file=sys.stderr)
         sys.exit(1)
@@ -3,6 +3,8 @@ Future Hause — Draft CLI
 
 Runs DraftAgent, writes a review payload to disk,
 and optionally triggers manual review (human-confirmed).
+
+Run from the project root: python -m cli.run_draft --event ... --content ...
 """
 
 import argparse
@@ -10,12 +12,10 @@ import json
 import sys
 from pathlib import Path
 
-# Ensure project root is on path (same fix as review CLI)
-PROJECT_ROOT = Path(__file__).resolve().parents[1]
-sys.path.insert(0, str(PROJECT_ROOT))
+import orjson
 
-from engine.agents.draft_agent import run as run_draft_agent  # noqa: E402
-from engine.review.manual_review import request_review  # noqa: E402
+from engine.agents.draft_agent import run as run_draft_agent
+from engine.review.manual_review import request_review
 
 
 def main():
@@ -66,8 +66,8 @@ def main():
     out_path = Path(args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(out_path, "w") as f:
-        json.dump(payload, f, indent=2)
+    # Encode once, write once (json.dump issues a write per token)
+    out_path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
 
     print(f"[ok] Draft completed")
     print(f"[ok] Review payload written to: {out_path}")
@@ -4,25 +4,23 @@ Creates deterministic advisories from promoted projects.
 """
 
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 
 
-def generate_advisories(state):
+def generate_advisories(state, now_iso=None):
     """
     Generates advisories from newly promoted projects.
     Deduplicates by source_signal_id.
     """
 
-    advisories = state.setdefault("advisories", {
-        "open": [],
-        "resolved": [],
-        "dismissed": []
-    })
+    now_iso = now_iso or datetime.now(timezone.utc).isoformat()
+
+    # Keyed by advisory id; each advisory carries its own status
+    advisories = state.setdefault("advisories", {}).setdefault("by_id", {})
 
     existing_source_ids = {
         a["source_signal_id"]
-        for bucket in advisories.values()
-        for a in bucket
+        for a in advisories.values()
     }
 
     new_advisories = []
@@ -46,10 +44,10 @@ def generate_advisories(state):
             "recommendation": "Review and determine if KB update is required.",
             "status": "open",
             "priority": "normal",
-            "created_at": datetime.utcnow().isoformat()
+            "created_at": now_iso
         }
 
-        advisories["open"].append(advisory)
+        advisories[advisory["id"]] = advisory
         new_advisories.append(advisory)
 
     return new_advisories
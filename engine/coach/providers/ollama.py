@@ -1,6 +1,9 @@
-import requests
 from datetime import datetime, timezone
 
+import orjson
+
+from engine.llm_adapter import SESSION
+
 OLLAMA_URL = "http://127.0.0.1:11434/api/generate"
 MODEL = "llama3.2:3b-instruct-q4_1"
 TIMEOUT = 60
@@ -26,10 +29,10 @@ def run_coach(draft_id: str, draft_text: str) -> dict:
         "stream": False,
     }
 
-    r = requests.post(OLLAMA_URL, json=payload, timeout=TIMEOUT)
+    r = SESSION.post(OLLAMA_URL, json=payload, timeout=TIMEOUT)
     r.raise_for_status()
 
-    text = r.json().get("response", "").strip()
+    text = orjson.loads(r.content).get("response", "").strip()
     if not text:
         text = "Looks good as-is."
 
@@ -1,6 +1,9 @@
-import requests
 from datetime import datetime, timezone
 
+import orjson
+
+from engine.llm_adapter import SESSION
+
 # ──────────────────────────────────────────────
 # Ollama configuration
 # ──────────────────────────────────────────────
@@ -67,7 +70,7 @@ PAIN POINT:
         "stream": False,
     }
 
-    response = requests.post(
+    response = SESSION.post(
         OLLAMA_URL,
         json=payload,
         timeout=TIMEOUT,
@@ -75,7 +78,7 @@ PAIN POINT:
 
     response.raise_for_status()
 
-    coach_text = response.json().get("response", "").strip()
+    coach_text = orjson.loads(response.content).get("response", "").strip()
     if not coach_text:
         coach_text = "No support assets generated."
 
@@ -2,6 +2,8 @@ from datetime import datetime
 from typing import Dict, List, Literal
 import uuid
 
+import orjson
+
 
 # ─────────────────────────────────────────────
 # Draft Status Enum
@@ -50,6 +52,22 @@ class DraftWork:
         self.status: DraftStatus = "drafted"
         self.tags = tags or []
 
+        # (status, bytes) of the last to_json(); body, format and tags are
+        # fixed once created, so only a status change invalidates it
+        self._json = (None, b"")
+
+    def to_json(self) -> bytes:
+        """Serialized public view, as served by /api/draft/<id>."""
+        if self._json[0] != self.status:
+            self._json = (self.status, orjson.dumps({
+                "draft_id": self.draft_id,
+                "body": self.content["body"],
+                "format": self.content["format"],
+                "status": self.status,
+                "tags": self.tags,
+            }))
+        return self._json[1]
+
 
 # ─────────────────────────────────────────────
 # DraftReview Entity (read-only attachment)
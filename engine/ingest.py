@@ -12,21 +12,21 @@ from datetime import datetime
 
 
 # Supported source types (authoritative)
-VALID_SOURCE_TYPES = {
+VALID_SOURCE_TYPES = frozenset({
     "reddit",
     "notes",
     "external",
     "freshdesk",
     "manual",
-}
+})
 
 # Supported projects (authoritative)
-VALID_PROJECTS = {
+VALID_PROJECTS = frozenset({
     "futurehub",
     "freshdesk-ai",
     "help-nearby",
     "other",
-}
+})
 
 
 def validate_intel(payload: Dict) -> Dict:
@@ -63,7 +63,7 @@ def validate_intel(payload: Dict) -> Dict:
     content = payload.get("content")
     if not content:
         errors.append("Missing required field: content")
-    elif not isinstance(content, str) or len(content.strip()) == 0:
+    elif type(content) is not str or not content.strip():
         errors.append("Content must be a non-empty string")
 
     # Check timestamp (optional)
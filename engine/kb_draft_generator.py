@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from engine.state_manager import load_state
+from engine.state_manager import read_state
 from engine.draft_work_log import create_draft, DRAFT_WORK_LOG
 
 
@@ -12,7 +12,7 @@ def run_kb_draft_generation(llm_callable):
     Pure pre-drafting layer.
     """
 
-    state = load_state()
+    state = read_state()
     candidates = state["proposals"]["kb_candidates"]
 
     drafts_created = 0
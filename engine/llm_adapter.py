@@ -1,26 +1,77 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 
 OLLAMA_URL = "http://127.0.0.1:11434/api/generate"
 DEFAULT_MODEL = "llama3.1:latest"
 
+# How long Ollama keeps the model loaded after a call. Keeping it resident
+# also keeps its prompt cache, so fixed prompt prefixes are not re-prefilled.
+OLLAMA_KEEP_ALIVE = os.getenv("FH_OLLAMA_KEEP_ALIVE", "24h")
 
-def call_llm(prompt: str, model: str = DEFAULT_MODEL) -> str:
+# One keep-alive connection pool for every Ollama call in the process
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=8, pool_maxsize=32))
+
+# Exact-match response cache size (FH_LLM_CACHE=<entries>). Off by default:
+# with it on, a repeated prompt returns the earlier generation verbatim.
+LLM_CACHE_SIZE = int(os.getenv("FH_LLM_CACHE", "0"))
+
+_RESPONSES = OrderedDict()
+_RESPONSES_LOCK = threading.Lock()
+
+
+def cached_response(model: str, prompt: str, generate) -> str:
     """
-    Minimal Ollama adapter.
-    Returns raw text response from model.
+    Return the cached text for (model, prompt), or call `generate()` and
+    cache what it returns. Exceptions are never cached.
     """
+    if LLM_CACHE_SIZE <= 0:
+        return generate()
+
+    key = hashlib.sha256(f"{model}\0{prompt}".encode()).digest()
+    with _RESPONSES_LOCK:
+        text = _RESPONSES.get(key)
+        if text is not None:
+            _RESPONSES.move_to_end(key)
+            return text
+
+    text = generate()
 
-    response = requests.post(
+    with _RESPONSES_LOCK:
+        _RESPONSES[key] = text
+        if len(_RESPONSES) > LLM_CACHE_SIZE:
+            _RESPONSES.popitem(last=False)
+    return text
+
+
+def _generate(prompt: str, model: str) -> str:
+    response = SESSION.post(
         OLLAMA_URL,
-        json={
+        data=orjson.dumps({
             "model": model,
             "prompt": prompt,
             "stream": False,
-        },
+            "keep_alive": OLLAMA_KEEP_ALIVE,
+        }),
+        headers={"Content-Type": "application/json"},
         timeout=120,
     )
 
     response.raise_for_status()
 
-    data = response.json()
+    data = orjson.loads(response.content)
     return data.get("response", "").strip()
+
+
+def call_llm(prompt: str, model: str = DEFAULT_MODEL) -> str:
+    """
+    Minimal Ollama adapter.
+    Returns raw text response from model.
+    """
+    return cached_response(model, prompt, lambda: _generate(prompt, model))
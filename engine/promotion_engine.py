@@ -16,7 +16,7 @@ Deterministic. No LLM calls. No external dependencies.
 import uuid
 from datetime import datetime, timezone
 from typing import Literal
-from engine.state_manager import load_state, save_state
+from engine.state_manager import read_state, state_transaction
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -55,39 +55,38 @@ def record_approval(
     Raises:
         ValueError: If proposal_id not found or already approved
     """
-    state = load_state()
-
-    # Validate proposal_type
-    if proposal_type not in ("kb_candidate", "project_candidate"):
-        raise ValueError(f"Invalid proposal_type: {proposal_type}. Must be 'kb_candidate' or 'project_candidate'")
-
-    # Validate approved_by is provided
-    if not approved_by or not approved_by.strip():
-        raise ValueError("approved_by is required for audit trail")
-
-    # Find the proposal
-    proposal = _find_proposal(state, proposal_id, proposal_type)
-    if proposal is None:
-        raise ValueError(f"Proposal not found: {proposal_id} (type: {proposal_type})")
-
-    # Check if already approved
-    if _is_proposal_already_approved(state, proposal_id):
-        raise ValueError(f"Proposal already approved: {proposal_id}")
-
-    # Create decision record
-    decision_id = str(uuid.uuid4())
-    decision = {
-        "id": decision_id,
-        "proposal_id": proposal_id,
-        "proposal_type": proposal_type,
-        "approved_by": approved_by.strip(),
-        "rationale": rationale.strip() if rationale else None,
-        "approved_at": datetime.now(timezone.utc).isoformat(),
-        "promoted": False,  # Tracks whether promotion has occurred
-    }
-
-    state["decisions"]["approved"].append(decision)
-    save_state(state)
+    # Joins the caller's transaction if one is open (one load, one save)
+    with state_transaction() as state:
+        # Validate proposal_type
+        if proposal_type not in ("kb_candidate", "project_candidate"):
+            raise ValueError(f"Invalid proposal_type: {proposal_type}. Must be 'kb_candidate' or 'project_candidate'")
+
+        # Validate approved_by is provided
+        if not approved_by or not approved_by.strip():
+            raise ValueError("approved_by is required for audit trail")
+
+        # Find the proposal
+        proposal = _find_proposal(state, proposal_id, proposal_type)
+        if proposal is None:
+            raise ValueError(f"Proposal not found: {proposal_id} (type: {proposal_type})")
+
+        # Check if already approved
+        if _is_proposal_already_approved(state, proposal_id):
+            raise ValueError(f"Proposal already approved: {proposal_id}")
+
+        # Create decision record
+        decision_id = str(uuid.uuid4())
+        decision = {
+            "id": decision_id,
+            "proposal_id": proposal_id,
+            "proposal_type": proposal_type,
+            "approved_by": approved_by.strip(),
+            "rationale": rationale.strip() if rationale else None,
+            "approved_at": datetime.now(timezone.utc).isoformat(),
+            "promoted": False,  # Tracks whether promotion has occurred
+        }
+
+        state["decisions"]["approved"].append(decision)
 
     return {
         "status": "recorded",
@@ -118,40 +117,39 @@ def record_rejection(
     Raises:
         ValueError: If proposal_id not found or already decided
     """
-    state = load_state()
-
-    # Validate proposal_type
-    if proposal_type not in ("kb_candidate", "project_candidate"):
-        raise ValueError(f"Invalid proposal_type: {proposal_type}")
-
-    # Validate required fields
-    if not rejected_by or not rejected_by.strip():
-        raise ValueError("rejected_by is required for audit trail")
-    if not rationale or not rationale.strip():
-        raise ValueError("rationale is required for rejections")
-
-    # Find the proposal
-    proposal = _find_proposal(state, proposal_id, proposal_type)
-    if proposal is None:
-        raise ValueError(f"Proposal not found: {proposal_id} (type: {proposal_type})")
-
-    # Check if already decided
-    if _is_proposal_already_decided(state, proposal_id):
-        raise ValueError(f"Proposal already has a decision: {proposal_id}")
-
-    # Create rejection record
-    decision_id = str(uuid.uuid4())
-    decision = {
-        "id": decision_id,
-        "proposal_id": proposal_id,
-        "proposal_type": proposal_type,
-        "rejected_by": rejected_by.strip(),
-        "rationale": rationale.strip(),
-        "rejected_at": datetime.now(timezone.utc).isoformat(),
-    }
-
-    state["decisions"]["rejected"].append(decision)
-    save_state(state)
+    # Joins the caller's transaction if one is open (one load, one save)
+    with state_transaction() as state:
+        # Validate proposal_type
+        if proposal_type not in ("kb_candidate", "project_candidate"):
+            raise ValueError(f"Invalid proposal_type: {proposal_type}")
+
+        # Validate required fields
+        if not rejected_by or not rejected_by.strip():
+            raise ValueError("rejected_by is required for audit trail")
+        if not rationale or not rationale.strip():
+            raise ValueError("rationale is required for rejections")
+
+        # Find the proposal
+        proposal = _find_proposal(state, proposal_id, proposal_type)
+        if proposal is None:
+            raise ValueError(f"Proposal not found: {proposal_id} (type: {proposal_type})")
+
+        # Check if already decided
+        if _is_proposal_already_decided(state, proposal_id):
+            raise ValueError(f"Proposal already has a decision: {proposal_id}")
+
+        # Create rejection record
+        decision_id = str(uuid.uuid4())
+        decision = {
+            "id": decision_id,
+            "proposal_id": proposal_id,
+            "proposal_type": proposal_type,
+            "rejected_by": rejected_by.strip(),
+            "rationale": rationale.strip(),
+            "rejected_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+        state["decisions"]["rejected"].append(decision)
 
     return {
         "status": "rejected",
@@ -191,86 +189,91 @@ def run_promotion(triggered_by: str) -> PromotionResult:
     if not triggered_by or not triggered_by.strip():
         raise ValueError("triggered_by is required - promotion must be human-triggered")
 
-    state = load_state()
-
-    kb_promoted = 0
-    project_promoted = 0
-    errors = []
-    promotions = []
-
-    # Process all un-promoted approvals
-    for decision in state["decisions"]["approved"]:
-        if decision.get("promoted", False):
-            continue  # Skip already promoted
-
-        decision_id = decision["id"]
-        proposal_id = decision["proposal_id"]
-        proposal_type = decision["proposal_type"]
-
-        try:
-            # Find the original proposal
-            proposal = _find_proposal(state, proposal_id, proposal_type)
-            if proposal is None:
-                errors.append({
-                    "decision_id": decision_id,
+    # Joins the caller's transaction if one is open (one load, one save)
+    with state_transaction() as state:
+        kb_promoted = 0
+        project_promoted = 0
+        errors = []
+        promotions = []
+
+        # Indexed once per run instead of scanning action_log per decision
+        promoted_ids = _promoted_proposal_ids(state)
+
+        # One timestamp for the whole batch
+        promoted_at = datetime.now(timezone.utc).isoformat()
+
+        # Process all un-promoted approvals
+        for decision in state["decisions"]["approved"]:
+            if decision.get("promoted", False):
+                continue  # Skip already promoted
+
+            decision_id = decision["id"]
+            proposal_id = decision["proposal_id"]
+            proposal_type = decision["proposal_type"]
+
+            try:
+                # Find the original proposal
+                proposal = _find_proposal(state, proposal_id, proposal_type)
+                if proposal is None:
+                    errors.append({
+                        "decision_id": decision_id,
+                        "proposal_id": proposal_id,
+                        "error": "Proposal not found - may have been removed",
+                    })
+                    continue
+
+                # Check for double-promotion via action_log
+                if proposal_id in promoted_ids:
+                    errors.append({
+                        "decision_id": decision_id,
+                        "proposal_id": proposal_id,
+                        "error": "Double-promotion prevented - already in action_log",
+                    })
+                    decision["promoted"] = True  # Mark to prevent future attempts
+                    continue
+
+                # Create mutation
+                mutation_id = str(uuid.uuid4())
+                mutation = _create_mutation(proposal, decision, mutation_id, promoted_at)
+
+                # Add to appropriate state_mutations bucket
+                if proposal_type == "kb_candidate":
+                    state["state_mutations"]["kb"].append(mutation)
+                    kb_promoted += 1
+                elif proposal_type == "project_candidate":
+                    state["state_mutations"]["projects"].append(mutation)
+                    project_promoted += 1
+
+                # Record in action_log
+                action_entry = _create_action_log_entry(
+                    proposal_id=proposal_id,
+                    decision_id=decision_id,
+                    mutation_id=mutation_id,
+                    proposal_type=proposal_type,
+                    triggered_by=triggered_by.strip(),
+                    timestamp=promoted_at,
+                )
+                state["state_mutations"]["action_log"].append(action_entry)
+                promoted_ids.add(proposal_id)
+
+                # Mark decision as promoted
+                decision["promoted"] = True
+                decision["promoted_at"] = promoted_at
+                decision["mutation_id"] = mutation_id
+
+                promotions.append({
                     "proposal_id": proposal_id,
-                    "error": "Proposal not found - may have been removed",
+                    "decision_id": decision_id,
+                    "mutation_id": mutation_id,
+                    "type": proposal_type,
                 })
-                continue
 
-            # Check for double-promotion via action_log
-            if _is_already_promoted_in_action_log(state, proposal_id):
+            except Exception as e:
                 errors.append({
                     "decision_id": decision_id,
                     "proposal_id": proposal_id,
-                    "error": "Double-promotion prevented - already in action_log",
+                    "error": str(e),
                 })
-                decision["promoted"] = True  # Mark to prevent future attempts
-                continue
-
-            # Create mutation
-            mutation_id = str(uuid.uuid4())
-            mutation = _create_mutation(proposal, decision, mutation_id)
-
-            # Add to appropriate state_mutations bucket
-            if proposal_type == "kb_candidate":
-                state["state_mutations"]["kb"].append(mutation)
-                kb_promoted += 1
-            elif proposal_type == "project_candidate":
-                state["state_mutations"]["projects"].append(mutation)
-                project_promoted += 1
-
-            # Record in action_log
-            action_entry = _create_action_log_entry(
-                proposal_id=proposal_id,
-                decision_id=decision_id,
-                mutation_id=mutation_id,
-                proposal_type=proposal_type,
-                triggered_by=triggered_by.strip(),
-            )
-            state["state_mutations"]["action_log"].append(action_entry)
-
-            # Mark decision as promoted
-            decision["promoted"] = True
-            decision["promoted_at"] = datetime.now(timezone.utc).isoformat()
-            decision["mutation_id"] = mutation_id
-
-            promotions.append({
-                "proposal_id": proposal_id,
-                "decision_id": decision_id,
-                "mutation_id": mutation_id,
-                "type": proposal_type,
-            })
-
-        except Exception as e:
-            errors.append({
-                "decision_id": decision_id,
-                "proposal_id": proposal_id,
-                "error": str(e),
-            })
-
-    # Persist all changes
-    save_state(state)
 
     return {
         "status": "complete",
@@ -305,59 +308,59 @@ def promote_single(
     if not triggered_by or not triggered_by.strip():
         raise ValueError("triggered_by is required - promotion must be human-triggered")
 
-    state = load_state()
-
-    # Find the decision
-    decision = None
-    for d in state["decisions"]["approved"]:
-        if d["id"] == decision_id:
-            decision = d
-            break
-
-    if decision is None:
-        raise ValueError(f"Approved decision not found: {decision_id}")
-
-    if decision.get("promoted", False):
-        raise ValueError(f"Decision already promoted: {decision_id}")
-
-    proposal_id = decision["proposal_id"]
-    proposal_type = decision["proposal_type"]
-
-    # Check action_log for double-promotion
-    if _is_already_promoted_in_action_log(state, proposal_id):
-        raise ValueError(f"Double-promotion prevented - proposal {proposal_id} already in action_log")
-
-    # Find the proposal
-    proposal = _find_proposal(state, proposal_id, proposal_type)
-    if proposal is None:
-        raise ValueError(f"Proposal not found: {proposal_id}")
-
-    # Create mutation
-    mutation_id = str(uuid.uuid4())
-    mutation = _create_mutation(proposal, decision, mutation_id)
+    # Joins the caller's transaction if one is open (one load, one save)
+    with state_transaction() as state:
+        # Find the decision
+        decision = None
+        for d in state["decisions"]["approved"]:
+            if d["id"] == decision_id:
+                decision = d
+                break
 
-    # Add to appropriate bucket
-    if proposal_type == "kb_candidate":
-        state["state_mutations"]["kb"].append(mutation)
-    elif proposal_type == "project_candidate":
-        state["state_mutations"]["projects"].append(mutation)
+        if decision is None:
+            raise ValueError(f"Approved decision not found: {decision_id}")
 
-    # Record in action_log
-    action_entry = _create_action_log_entry(
-        proposal_id=proposal_id,
-        decision_id=decision_id,
-        mutation_id=mutation_id,
-        proposal_type=proposal_type,
-        triggered_by=triggered_by.strip(),
-    )
-    state["state_mutations"]["action_log"].append(action_entry)
+        if decision.get("promoted", False):
+            raise ValueError(f"Decision already promoted: {decision_id}")
 
-    # Mark decision as promoted
-    decision["promoted"] = True
-    decision["promoted_at"] = datetime.now(timezone.utc).isoformat()
-    decision["mutation_id"] = mutation_id
+        proposal_id = decision["proposal_id"]
+        proposal_type = decision["proposal_type"]
 
-    save_state(state)
+        # Check action_log for double-promotion
+        if _is_already_promoted_in_action_log(state, proposal_id):
+            raise ValueError(f"Double-promotion prevented - proposal {proposal_id} already in action_log")
+
+        # Find the proposal
+        proposal = _find_proposal(state, proposal_id, proposal_type)
+        if proposal is None:
+            raise ValueError(f"Proposal not found: {proposal_id}")
+
+        # Create mutation
+        promoted_at = datetime.now(timezone.utc).isoformat()
+        mutation_id = str(uuid.uuid4())
+        mutation = _create_mutation(proposal, decision, mutation_id, promoted_at)
+
+        # Add to appropriate bucket
+        if proposal_type == "kb_candidate":
+            state["state_mutations"]["kb"].append(mutation)
+        elif proposal_type == "project_candidate":
+            state["state_mutations"]["projects"].append(mutation)
+
+        # Record in action_log
+        action_entry = _create_action_log_entry(
+            proposal_id=proposal_id,
+            decision_id=decision_id,
+            mutation_id=mutation_id,
+            proposal_type=proposal_type,
+            triggered_by=triggered_by.strip(),
+            timestamp=promoted_at,
+        )
+        state["state_mutations"]["action_log"].append(action_entry)
+
+        # Mark decision as promoted
+        decision["promoted"] = True
+        decision["promoted_at"] = promoted_at
+        decision["mutation_id"] = mutation_id
 
     return {
         "status": "promoted",
@@ -380,7 +383,7 @@ def get_pending_promotions() -> list[dict]:
     Returns:
         List of decisions awaiting promotion
     """
-    state = load_state()
+    state = read_state()
     pending = []
 
     for decision in state["decisions"]["approved"]:
@@ -404,7 +407,7 @@ def get_promotion_history() -> list[dict]:
     Returns:
         List of promotion action_log entries
     """
-    state = load_state()
+    state = read_state()
     promotions = []
 
     for action in state["state_mutations"]["action_log"]:
@@ -424,7 +427,7 @@ def get_audit_trail(proposal_id: str) -> dict | None:
     Returns:
         dict with proposal, decision, and mutation details, or None if not found
     """
-    state = load_state()
+    state = read_state()
 
     # Find proposal
     proposal = None
@@ -543,7 +546,16 @@ def _is_already_promoted_in_action_log(state: dict, proposal_id: str) -> bool:
     return False
 
 
-def _create_mutation(proposal: dict, decision: dict, mutation_id: str) -> dict:
+def _promoted_proposal_ids(state: dict) -> set:
+    """Proposal IDs that already have a promotion entry in action_log."""
+    return {
+        action.get("proposal_id")
+        for action in state["state_mutations"]["action_log"]
+        if action.get("action_type") == "promotion"
+    }
+
+
+def _create_mutation(proposal: dict, decision: dict, mutation_id: str, created_at: str) -> dict:
     """Create a state mutation record from a proposal and decision."""
     return {
         "id": mutation_id,
@@ -554,7 +566,7 @@ def _create_mutation(proposal: dict, decision: dict, mutation_id: str) -> dict:
         "source_signal_id": proposal.get("source_signal_id"),
         "approved_by": decision.get("approved_by"),
         "approval_rationale": decision.get("rationale"),
-        "created_at": datetime.now(timezone.utc).isoformat(),
+        "created_at": created_at,
     }
 
 
@@ -564,6 +576,7 @@ def _create_action_log_entry(
     mutation_id: str,
     proposal_type: ProposalType,
     triggered_by: str,
+    timestamp: str,
 ) -> dict:
     """Create an action_log entry for a promotion."""
     # Determine target type for clarity
@@ -580,5 +593,5 @@ def _create_action_log_entry(
         "mutation_id": mutation_id,
         "target_type": target_type,
         "triggered_by": triggered_by,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": timestamp,
     }
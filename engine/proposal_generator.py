@@ -13,26 +13,24 @@ Uses state_manager for persistence.
 """
 
 import uuid
-import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
-from engine.state_manager import load_state, save_state
+import orjson
 
+from engine.state_manager import read_state, state_transaction
 
-# ---------------------------------------------------------
-# PROMPT TEMPLATE
-# ---------------------------------------------------------
 
-PROPOSAL_PROMPT = """
-You are an intelligence synthesis engine.
+# Concurrent LLM syntheses per proposal run
+MAX_WORKERS = 8
 
-Based on the following signal, generate a structured proposal.
 
-Signal:
-Category: {category}
-Summary: {summary}
-Confidence: {confidence}
+# ---------------------------------------------------------
+# PROMPT TEMPLATE
+# ---------------------------------------------------------
 
+# Literal JSON example: kept out of str.format, whose braces it would break
+_PROPOSAL_PROMPT_TAIL = """
 Respond ONLY in valid JSON:
 
 {
@@ -43,6 +41,20 @@ Respond ONLY in valid JSON:
 """
 
 
+def _build_proposal_prompt(signal: dict) -> str:
+    return (
+        "\nYou are an intelligence synthesis engine.\n"
+        "\n"
+        "Based on the following signal, generate a structured proposal.\n"
+        "\n"
+        "Signal:\n"
+        f"Category: {signal.get('category')}\n"
+        f"Summary: {signal.get('summary')}\n"
+        f"Confidence: {signal.get('confidence')}\n"
+        f"{_PROPOSAL_PROMPT_TAIL}"
+    )
+
+
 # ---------------------------------------------------------
 # INTERNAL HELPERS
 # ---------------------------------------------------------
@@ -62,15 +74,11 @@ def _get_existing_proposal_source_ids(state: dict) -> set:
 
 
 def _generate_with_llm(signal: dict, llm_callable):
-    prompt = PROPOSAL_PROMPT.format(
-        category=signal.get("category"),
-        summary=signal.get("summary"),
-        confidence=signal.get("confidence"),
-    )
+    prompt = _build_proposal_prompt(signal)
 
     try:
         raw = llm_callable(prompt)
-        parsed = json.loads(raw)
+        parsed = orjson.loads(raw)
 
         return {
             "title": parsed.get("title", signal.get("summary", "")[:80]),
@@ -87,7 +95,7 @@ def _generate_with_llm(signal: dict, llm_callable):
         }
 
 
-def _create_candidate(signal: dict, proposal_data: dict) -> dict:
+def _create_candidate(signal: dict, proposal_data: dict, created_at: str) -> dict:
     return {
         "id": str(uuid.uuid4()),
         "source_signal_id": signal.get("id"),
@@ -95,7 +103,7 @@ def _create_candidate(signal: dict, proposal_data: dict) -> dict:
         "summary": proposal_data["summary"],
         "impact_score": proposal_data["impact_score"],
         "confidence": signal.get("confidence", 0.5),
-        "created_at": datetime.now(timezone.utc).isoformat(),
+        "created_at": created_at,
     }
 
 
@@ -103,24 +111,26 @@ def _create_candidate(signal: dict, proposal_data: dict) -> dict:
 # MAIN ENTRY
 # ---------------------------------------------------------
 
-def run_proposal_generation(llm_callable) -> dict:
+def plan_proposals(
+    llm_callable,
+    state: dict,
+    now_iso: str,
+    signals: list | None = None,
+) -> tuple:
     """
-    Generate proposals from perception signals.
+    LLM step only: candidates for signals that have no proposal yet.
 
-    LLM synthesizes title, summary, and impact_score.
-    Duplicate-safe.
+    Nothing is written, so this can run on a read_state() snapshot with
+    no transaction held. `signals` defaults to the state's own.
+    Returns ([(category, candidate), ...], stats).
     """
-
-    state = load_state()
-
-    signals = state["perception"]["signals"]
+    signals = state["perception"]["signals"] if signals is None else signals
     existing_source_ids = _get_existing_proposal_source_ids(state)
 
-    kb_generated = 0
-    project_generated = 0
     skipped_duplicate = 0
     skipped_unknown_category = 0
 
+    todo = []
     for signal in signals:
         signal_id = signal.get("id")
 
@@ -134,8 +144,48 @@ def run_proposal_generation(llm_callable) -> dict:
             skipped_unknown_category += 1
             continue
 
-        proposal_data = _generate_with_llm(signal, llm_callable)
-        candidate = _create_candidate(signal, proposal_data)
+        todo.append((signal, category))
+
+    # LLM calls are independent and I/O-bound: overlap them, then keep
+    # the results in signal order
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        proposals = list(ex.map(
+            lambda item: _generate_with_llm(item[0], llm_callable),
+            todo,
+        ))
+
+    candidates = [
+        (category, _create_candidate(signal, proposal_data, now_iso))
+        for (signal, category), proposal_data in zip(todo, proposals)
+    ]
+
+    return candidates, {
+        "skipped_duplicate": skipped_duplicate,
+        "skipped_unknown_category": skipped_unknown_category,
+        "total_signals_processed": len(signals),
+    }
+
+
+def apply_proposals(state: dict, candidates: list) -> dict:
+    """
+    Add planned candidates to state (inside the caller's transaction).
+
+    State may have moved on since planning, so candidates whose signal is
+    gone or already has a proposal are dropped.
+    """
+    signal_ids = {s.get("id") for s in state["perception"]["signals"]}
+    existing_source_ids = _get_existing_proposal_source_ids(state)
+
+    kb_generated = 0
+    project_generated = 0
+    skipped_duplicate = 0
+
+    for category, candidate in candidates:
+        source_id = candidate["source_signal_id"]
+        if source_id not in signal_ids or source_id in existing_source_ids:
+            skipped_duplicate += 1
+            continue
+        existing_source_ids.add(source_id)
 
         if category == "discussion":
             state["proposals"]["kb_candidates"].append(candidate)
@@ -144,13 +194,44 @@ def run_proposal_generation(llm_callable) -> dict:
             state["proposals"]["project_candidates"].append(candidate)
             project_generated += 1
 
-    save_state(state)
-
     return {
-        "status": "complete",
         "kb_candidates_generated": kb_generated,
         "project_candidates_generated": project_generated,
         "skipped_duplicate": skipped_duplicate,
-        "skipped_unknown_category": skipped_unknown_category,
-        "total_signals_processed": len(signals),
+    }
+
+
+def run_proposal_generation(
+    llm_callable,
+    state: dict | None = None,
+    now_iso: str | None = None,
+) -> dict:
+    """
+    Generate proposals from perception signals.
+
+    LLM synthesizes title, summary, and impact_score.
+    Duplicate-safe.
+
+    Pass `state` to work inside a caller's transaction (the caller saves).
+    Otherwise the LLM calls run on a snapshot and the state lock is only
+    taken to add the results. `now_iso` stamps every candidate from this run.
+    """
+
+    now_iso = now_iso or datetime.now(timezone.utc).isoformat()
+
+    if state is None:
+        candidates, stats = plan_proposals(llm_callable, read_state(), now_iso)
+        with state_transaction(now_iso) as state:
+            applied = apply_proposals(state, candidates)
+    else:
+        candidates, stats = plan_proposals(llm_callable, state, now_iso)
+        applied = apply_proposals(state, candidates)
+
+    return {
+        "status": "complete",
+        "kb_candidates_generated": applied["kb_candidates_generated"],
+        "project_candidates_generated": applied["project_candidates_generated"],
+        "skipped_duplicate": stats["skipped_duplicate"] + applied["skipped_duplicate"],
+        "skipped_unknown_category": stats["skipped_unknown_category"],
+        "total_signals_processed": stats["total_signals_processed"],
     }
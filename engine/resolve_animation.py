@@ -1,15 +1,27 @@
-import yaml
+from functools import lru_cache
 from pathlib import Path
 
+import yaml
+
 
 PANEL_CONFIG = Path("docs/dashboard_panels.yaml")
 ANIMATION_CONFIG = Path("docs/animation_states.yaml")
 
+# libyaml-backed loader when available
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def load_yaml(path: Path):
     if not path.exists():
         raise FileNotFoundError(f"Missing config: {path}")
-    return yaml.safe_load(path.read_text())
+    return yaml.load(path.read_text(), Loader=YAML_LOADER)
+
+
+def _mtime(path: Path):
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
 
 
 def resolve_animation(panel_name: str, engine_state: str) -> str | None:
@@ -18,6 +30,13 @@ def resolve_animation(panel_name: str, engine_state: str) -> str | None:
     No UI logic. No side effects.
     """
 
+    # Results are memoized per config file version; editing either YAML
+    # file changes its mtime and so the cache key
+    return _resolve(panel_name, engine_state, _mtime(PANEL_CONFIG), _mtime(ANIMATION_CONFIG))
+
+
+@lru_cache(maxsize=64)
+def _resolve(panel_name: str, engine_state: str, panel_mtime, animation_mtime) -> str | None:
     panels = load_yaml(PANEL_CONFIG)["panels"]
     animations = load_yaml(ANIMATION_CONFIG)["animations"]
 
@@ -10,6 +10,11 @@ from engine.review.ReviewEngineAdapter import ReviewEngineAdapter, ReviewResult
 
 
 class KimiReviewAdapter(ReviewEngineAdapter):
+    """
+    Shared across requests by manual_review.get_provider().
+    review() must not mutate instance state (thread-safe by construction).
+    """
+
     def __init__(self, api_key: str, model: str = "kimi-k2.5"):
         if not api_key:
             raise ValueError("KimiReviewAdapter requires an API key")
@@ -5,8 +5,51 @@ Reviews are NEVER automatic.
 This module is called explicitly by a human or UI action.
 """
 
+import threading
 from typing import Dict
-from engine.review.kimi_review_adapter import KimiReviewAdapter
+
+
+def _load_kimi():
+    # Imported on first use so importing this module stays cheap
+    from engine.review.kimi_review_adapter import KimiReviewAdapter
+
+    # In real usage, API keys will come from secure config
+    return KimiReviewAdapter(api_key="KIMI_API_KEY_PLACEHOLDER")
+
+
+PROVIDERS = {
+    "kimi": _load_kimi,
+}
+
+# One shared instance per provider (providers must be thread-safe)
+_PROVIDER_SINGLETONS: Dict[str, object] = {}
+_PROVIDER_LOCK = threading.Lock()
+
+
+def get_provider(provider_name: str):
+    """
+    Return the shared provider instance, creating it on first use.
+    """
+    provider = _PROVIDER_SINGLETONS.get(provider_name)
+    if provider is None:
+        with _PROVIDER_LOCK:
+            provider = _PROVIDER_SINGLETONS.get(provider_name)
+            if provider is None:
+                provider = PROVIDERS[provider_name]()
+                _PROVIDER_SINGLETONS[provider_name] = provider
+    return provider
+
+
+def close_providers() -> None:
+    """
+    Release shared provider instances (and any clients they hold).
+    """
+    with _PROVIDER_LOCK:
+        for provider in _PROVIDER_SINGLETONS.values():
+            close = getattr(provider, "close", None)
+            if callable(close):
+                close()
+        _PROVIDER_SINGLETONS.clear()
 
 
 def request_review(review_payload: Dict) -> Dict:
@@ -14,8 +57,7 @@ def request_review(review_payload: Dict) -> Dict:
     Manually trigger a review for a draft or agent output.
     """
 
-    # In real usage, API keys will come from secure config
-    kimi = KimiReviewAdapter(api_key="KIMI_API_KEY_PLACEHOLDER")
+    kimi = get_provider("kimi")
 
     review_result = kimi.review(review_payload)
 
@@ -1,9 +1,17 @@
-import requests
+import re
 from datetime import datetime, timezone
 
+import orjson
+
+from engine.llm_adapter import SESSION
+
 from .base import ReviewProvider
 
 
+# Risk keywords, matched case-insensitively in a single pass
+_RISK_RE = re.compile(r"risk|misleading", re.IGNORECASE)
+
+
 # =============================================================================
 # Coach Mode Entrypoint (delegates — NOT a provider)
 # =============================================================================
@@ -88,7 +96,7 @@ class OllamaReviewProvider(ReviewProvider):
             "stream": False,
         }
 
-        r = requests.post(
+        r = SESSION.post(
             self.OLLAMA_URL,
             json=payload,
             timeout=self.TIMEOUT,
@@ -97,7 +105,7 @@ class OllamaReviewProvider(ReviewProvider):
         if r.status_code != 200:
             raise RuntimeError(f"Ollama HTTP {r.status_code}: {r.text}")
 
-        return r.json()
+        return orjson.loads(r.content)
 
     def _parse_response(self, response: dict):
         """
@@ -111,8 +119,7 @@ class OllamaReviewProvider(ReviewProvider):
         confidence = 0.6
         risk_flags = []
 
-        lowered = text.lower()
-        if "risk" in lowered or "misleading" in lowered:
+        if _RISK_RE.search(text):
             risk_flags.append("potential_risk")
 
         return text, confidence, risk_flags
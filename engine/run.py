@@ -1,7 +1,9 @@
-import json
+import atexit
+import os
 from datetime import datetime, timezone
 from pathlib import Path
 
+import orjson
 import yaml
 
 from .resolve_animation import resolve_animation
@@ -13,14 +15,33 @@ from .resolve_animation import resolve_animation
 
 CONFIG_PATH = Path("config/future_hause.yaml")
 STATE_PATH = Path("engine/state.json")
-LOG_PATH = Path("engine/log.json")
+LOG_PATH = Path("engine/log.jsonl")
 RAW_REDDIT_PATH = Path("data/raw/reddit_stub.json")
 
+# Pretty-print engine output for humans (FH_DEBUG=1). Compact by default.
+DEBUG = os.getenv("FH_DEBUG", "0") == "1"
+
+# libyaml-backed loader when available
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Process-wide append-only descriptor for LOG_PATH (opened lazily)
+_LOG_FD = None
+
+# Parsed config, reused until the file's mtime changes
+_CONFIG_CACHE = {"mtime": None, "config": None}
+
 
 # ============================
 # Utilities
 # ============================
 
+def _dumps(payload) -> bytes:
+    """
+    Serialize engine output (indented only in debug mode)
+    """
+    return orjson.dumps(payload, option=orjson.OPT_INDENT_2 if DEBUG else 0)
+
+
 def write_state(payload: dict):
     """
     Write engine state to engine/state.json
@@ -29,69 +50,98 @@ def write_state(payload: dict):
         raise TypeError("write_state expects a dict payload")
 
     STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    STATE_PATH.write_text(
-        json.dumps(payload, indent=2)
-    )
 
+    # Write aside, then swap in: the dashboard never reads a torn file
+    tmp = STATE_PATH.with_suffix(".json.tmp")
+    tmp.write_bytes(_dumps(payload))
+    os.replace(tmp, STATE_PATH)
+
+
+def update_state_fields(**patch):
+    """
+    Merge fields into engine/state.json, writing only if something changed
+    """
+    current = orjson.loads(STATE_PATH.read_bytes()) if STATE_PATH.exists() else {}
+    merged = {**current, **patch}
+
+    if merged != current:
+        write_state(merged)
 
 
-def log_event(message: str):
+def log_event(message: str, when: str | None = None):
     """
-    Append an event to engine/log.json
+    Append an event to engine/log.jsonl (one JSON object per line)
+
+    `when` lets a caller stamp several events with one timestamp.
     """
-    LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    global _LOG_FD
 
-    logs = []
-    if LOG_PATH.exists():
-        logs = json.loads(LOG_PATH.read_text())
+    if _LOG_FD is None:
+        LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _LOG_FD = os.open(LOG_PATH, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        atexit.register(_close_log)
 
-    logs.append({
-        "time": datetime.now(timezone.utc).isoformat(),
+    entry = {
+        "time": when or datetime.now(timezone.utc).isoformat(),
         "message": message
-    })
+    }
 
+    # O_APPEND makes each single write() land atomically at end of file
+    os.write(_LOG_FD, orjson.dumps(entry) + b"\n")
 
-    LOG_PATH.write_text(
-        json.dumps(logs, indent=2)
-    )
+
+def _close_log():
+    global _LOG_FD
+
+    if _LOG_FD is not None:
+        os.close(_LOG_FD)
+        _LOG_FD = None
 
 
 def load_config() -> dict:
     """
-    Load config/future_hause.yaml
+    Load config/future_hause.yaml (cached; treat the result as read-only)
     """
     if not CONFIG_PATH.exists():
         raise FileNotFoundError("Missing config/future_hause.yaml")
 
-    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    mtime = CONFIG_PATH.stat().st_mtime_ns
+    if _CONFIG_CACHE["mtime"] != mtime:
+        with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+            _CONFIG_CACHE["config"] = yaml.load(f, Loader=YAML_LOADER)
+        _CONFIG_CACHE["mtime"] = mtime
+
+    return _CONFIG_CACHE["config"]
 
 
 # ============================
 # Collectors (v0.1 stubs)
 # ============================
 
-def run_reddit_collector_stub():
+# Fixed part of the stub payload; only the timestamp varies per run.
+# Never mutated: each run builds a new dict on top of it.
+REDDIT_STUB_TEMPLATE = {
+    "source": "reddit",
+    "type": "stub",
+    "posts": ()
+}
+
+
+def run_reddit_collector_stub(now: str | None = None):
     """
     Stub collector for Reddit.
     Writes placeholder raw data.
     No network calls.
     """
-    RAW_REDDIT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    now = now or datetime.now(timezone.utc).isoformat()
 
-    stub_payload = {
-        "source": "reddit",
-        "type": "stub",
-        "collected_at": datetime.now(timezone.utc).isoformat(),
-        "posts": []
-    }
+    RAW_REDDIT_PATH.parent.mkdir(parents=True, exist_ok=True)
 
+    stub_payload = {**REDDIT_STUB_TEMPLATE, "collected_at": now}
 
-    RAW_REDDIT_PATH.write_text(
-        json.dumps(stub_payload, indent=2)
-    )
+    RAW_REDDIT_PATH.write_bytes(_dumps(stub_payload))
 
-    log_event("Reddit raw data stub written to data/raw/reddit_stub.json")
+    log_event("Reddit raw data stub written to data/raw/reddit_stub.json", when=now)
 
 
 # ============================
@@ -99,10 +149,13 @@ def run_reddit_collector_stub():
 # ============================
 
 def run():
+    # --- Run timestamp (shared by every event in this run) ---
+    now = datetime.now(timezone.utc).isoformat()
+
     # --- Initial state ---
     current_state = "collecting"
 
-    log_event("Future Hause run started")
+    log_event("Future Hause run started", when=now)
 
     # --- Resolve animation ---
     current_animation = resolve_animation(
@@ -114,7 +167,7 @@ def run():
     write_state({
         "state": current_state,
         "current_animation": current_animation,
-        "updated_at": datetime.now(timezone.utc).isoformat()
+        "updated_at": now
     })
 
     # --- Load config ---
@@ -123,29 +176,28 @@ def run():
     scope = fh_config.get("scope", {})
     collect_scope = scope.get("collect", {})
 
-    log_event(f"Loaded config version: {fh_config.get('version', 'unknown')}")
-    log_event(f"Collection scope: {collect_scope}")
+    log_event(f"Loaded config version: {fh_config.get('version', 'unknown')}", when=now)
+    log_event(f"Collection scope: {collect_scope}", when=now)
 
     # --- Run collectors ---
     if collect_scope.get("reddit", False):
-        run_reddit_collector_stub()
+        run_reddit_collector_stub(now)
     else:
-        log_event("Reddit collector disabled by config")
+        log_event("Reddit collector disabled by config", when=now)
 
     # --- v0.1 scope ends here ---
-    log_event("No analysis or drafting executed (v0.1 scope)")
+    log_event("No analysis or drafting executed (v0.1 scope)", when=now)
 
-       # --- Final state ---
-    write_state({
-        "state": "done",
-        "current_animation": resolve_animation(
+    # --- Final state (updated_at is unchanged: one timestamp per run) ---
+    update_state_fields(
+        state="done",
+        current_animation=resolve_animation(
             "engine_status",
             "done"
-        ),
-        "updated_at": datetime.now(timezone.utc).isoformat()
-    })
+        )
+    )
 
-    log_event("Future Hause run completed")
+    log_event("Future Hause run completed", when=now)
 
 
 # ============================
@@ -1,17 +1,23 @@
+import os
 import uuid
-import json
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 
-import requests
+import orjson
 
-from engine.state_manager import load_state, save_state
+from engine.llm_adapter import SESSION
+from engine.state_manager import read_state, state_transaction
 
 
 OLLAMA_URL = "http://127.0.0.1:11434/api/generate"
 OLLAMA_MODEL = "llama3"  # Change if desired
 
+# Concurrent Ollama classifications per extraction run
+MAX_WORKERS = 8
 
-PROMPT_TEMPLATE = """
+# The prompt embeds a literal JSON example, so it is assembled by
+# concatenation rather than str.format (its braces are not placeholders)
+_PROMPT_HEAD = """
 You are a strict classification engine.
 
 Classify the following content into structured JSON.
@@ -33,11 +39,17 @@ Respond ONLY in valid JSON with this structure:
 
 Content:
 \"\"\"
-{content}
+"""
+
+_PROMPT_TAIL = """
 \"\"\"
 """
 
 
+def _build_prompt(content: str) -> str:
+    return f"{_PROMPT_HEAD}{content}{_PROMPT_TAIL}"
+
+
 def call_llm(prompt: str) -> str:
     payload = {
         "model": OLLAMA_MODEL,
@@ -46,21 +58,21 @@ def call_llm(prompt: str) -> str:
     }
 
     try:
-        response = requests.post(OLLAMA_URL, json=payload, timeout=30)
+        response = SESSION.post(OLLAMA_URL, json=payload, timeout=30)
         response.raise_for_status()
-        return response.json().get("response", "").strip()
+        return orjson.loads(response.content).get("response", "").strip()
     except Exception:
         # Hard fallback if Ollama fails
         return ""
 
 
 def classify_with_llm(content: str):
-    prompt = PROMPT_TEMPLATE.format(content=content)
+    prompt = _build_prompt(content)
 
     raw_response = call_llm(prompt)
 
     try:
-        parsed = json.loads(raw_response)
+        parsed = orjson.loads(raw_response)
         return {
             "category": parsed.get("category", "discussion"),
             "summary": parsed.get("summary", content[:120]),
@@ -75,37 +87,87 @@ def classify_with_llm(content: str):
         }
 
 
-def run_signal_extraction():
-    state = load_state()
-
-    inputs = state["perception"]["inputs"]
-    existing_signal_input_ids = {
-        s["source_input_id"] for s in state["perception"]["signals"]
+def _id_batch(n: int) -> list:
+    """
+    n random (version 4) UUID strings drawn from a single urandom call.
+    """
+    buf = os.urandom(16 * n)
+    return [
+        str(uuid.UUID(bytes=buf[i * 16:(i + 1) * 16], version=4))
+        for i in range(n)
+    ]
+
+
+def _process(input_obj: dict, signal_id: str, created_at: str) -> dict:
+    classification = classify_with_llm(input_obj["content"])
+
+    return {
+        "id": signal_id,
+        "source_input_id": input_obj["id"],
+        "source": input_obj["source"],
+        "summary": classification["summary"],
+        "category": classification["category"],
+        "confidence": classification["confidence"],
+        "created_at": created_at,
     }
 
-    new_signals = []
 
-    for input_obj in inputs:
-        input_id = input_obj["id"]
+def extract_signals(state: dict, now: str | None = None) -> list:
+    """
+    LLM step only: signals for inputs that have none yet.
 
-        if input_id in existing_signal_input_ids:
-            continue
+    Nothing is written, so this can run on a read_state() snapshot with
+    no transaction held.
+    """
+    now = now or datetime.now(timezone.utc).isoformat()
 
-        classification = classify_with_llm(input_obj["content"])
-
-        signal = {
-            "id": str(uuid.uuid4()),
-            "source_input_id": input_id,
-            "source": input_obj["source"],
-            "summary": classification["summary"],
-            "category": classification["category"],
-            "confidence": classification["confidence"],
-            "created_at": datetime.utcnow().isoformat(),
-        }
-
-        state["perception"]["signals"].append(signal)
-        new_signals.append(signal)
-
-    save_state(state)
+    inputs = state["perception"]["inputs"]
+    existing_signal_input_ids = {
+        s["source_input_id"] for s in state["perception"]["signals"]
+    }
 
-    return new_signals
+    # One filtering pass; order follows inputs
+    todo = [i for i in inputs if i["id"] not in existing_signal_input_ids]
+
+    # LLM calls are network-bound; overlap them
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        return list(ex.map(
+            _process,
+            todo,
+            _id_batch(len(todo)),
+            [now] * len(todo),
+        ))
+
+
+def apply_signals(state: dict, new_signals: list) -> list:
+    """
+    Add extracted signals to state (inside the caller's transaction),
+    skipping inputs that gained a signal since extraction. Returns the
+    signals actually added.
+    """
+    existing_signal_input_ids = {
+        s["source_input_id"] for s in state["perception"]["signals"]
+    }
+    fresh = [
+        s for s in new_signals
+        if s["source_input_id"] not in existing_signal_input_ids
+    ]
+    state["perception"]["signals"].extend(fresh)
+    return fresh
+
+
+def run_signal_extraction(state: dict | None = None, now_iso: str | None = None):
+    """
+    Classify unprocessed inputs into signals.
+
+    Pass `state` to work inside a caller's transaction (the caller saves).
+    Otherwise the LLM calls run on a snapshot and the state lock is only
+    taken to add the results. `now_iso` stamps every new signal (defaults
+    to the current time).
+    """
+    if state is not None:
+        return apply_signals(state, extract_signals(state, now_iso))
+
+    new_signals = extract_signals(read_state(), now_iso)
+    with state_transaction(now_iso) as state:
+        return apply_signals(state, new_signals)
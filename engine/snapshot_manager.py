@@ -6,43 +6,74 @@ Creates immutable, timestamped snapshots of the cognition_state.json
 so intelligence can be regenerated, audited, compared, and rolled back.
 
 Snapshots live under: state/snapshots/
+Each snapshot also appends one line (id, path, counts) to
+state/snapshots/index.jsonl so snapshots can be listed without
+parsing them.
+
+Modes:
+    full   — embeds the whole state (default)
+    counts — counts and metadata only
+    diff   — JSON patch against the previous state-bearing snapshot
+             (rebuild with load_snapshot_state)
 """
 
-import json
 import uuid
 from pathlib import Path
 from datetime import datetime, timezone
 
-from engine.state_manager import load_state
+import orjson
+
+from engine.state_manager import read_state
 
 
 SNAPSHOT_DIR = Path("state/snapshots")
+SNAPSHOT_INDEX = SNAPSHOT_DIR / "index.jsonl"
+
+SNAPSHOT_FORMATS = ("json", "msgpack")
+SNAPSHOT_MODES = ("full", "counts", "diff")
 
 
 def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def create_snapshot(trigger: str, extra: dict | None = None) -> dict:
+def create_snapshot(
+    trigger: str,
+    extra: dict | None = None,
+    format: str = "json",
+    mode: str = "full",
+    state: dict | None = None,
+    snapshot_id: str | None = None,
+) -> dict:
     """
     Create an immutable snapshot of the current cognition state.
 
     Args:
         trigger: short label for what caused the snapshot (e.g., "signal_extraction", "proposal_generation")
         extra: optional metadata to store alongside the snapshot
+        format: "json" (default) or "msgpack" (smaller, faster; needs msgpack)
+        mode: "full" (default), "counts", or "diff" (needs jsonpatch)
+        state: the just-saved state, if the caller has it (skips a reload)
+        snapshot_id: id to use, when the caller hands it out before writing
 
     Returns:
         dict: snapshot metadata including snapshot_id and file path
     """
-    state = load_state()
+    if format not in SNAPSHOT_FORMATS:
+        raise ValueError(f"Invalid snapshot format: {format}. Must be one of {SNAPSHOT_FORMATS}")
+    if mode not in SNAPSHOT_MODES:
+        raise ValueError(f"Invalid snapshot mode: {mode}. Must be one of {SNAPSHOT_MODES}")
+
+    if state is None:
+        state = read_state()
 
     SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
 
-    snapshot_id = str(uuid.uuid4())
+    snapshot_id = snapshot_id or str(uuid.uuid4())
     created_at = _utc_now_iso()
     safe_trigger = (trigger or "unknown").strip().lower().replace(" ", "_")
 
-    filename = f"{created_at.replace(':', '').replace('.', '')}_{safe_trigger}_{snapshot_id[:8]}.json"
+    filename = f"{created_at.replace(':', '').replace('.', '')}_{safe_trigger}_{snapshot_id[:8]}.{format}"
     snapshot_path = SNAPSHOT_DIR / filename
 
     snapshot = {
@@ -65,13 +96,36 @@ def create_snapshot(trigger: str, extra: dict | None = None) -> dict:
             "action_log": len(state.get("state_mutations", {}).get("action_log", [])),
         },
         "extra": extra or {},
-        "state": state,  # full copy (immutable snapshot)
+        "mode": mode,
     }
 
-    with open(snapshot_path, "w", encoding="utf-8") as f:
-        json.dump(snapshot, f, indent=2)
+    if mode == "diff":
+        base = _latest_state_snapshot()
+        if base is None:
+            mode = snapshot["mode"] = "full"  # nothing to diff against yet
+        else:
+            import jsonpatch  # optional: only needed for diff snapshots
+
+            snapshot["base_snapshot_id"] = base["snapshot_id"]
+            snapshot["patch"] = jsonpatch.make_patch(
+                load_snapshot_state(base["snapshot_id"]), state
+            ).patch
+
+    if mode == "full":
+        snapshot["state"] = state  # full copy (immutable snapshot)
+
+    if format == "msgpack":
+        import msgpack  # optional: only needed for binary snapshots
+
+        data = msgpack.packb(snapshot, use_bin_type=True)
+    else:
+        data = orjson.dumps(snapshot, option=orjson.OPT_NON_STR_KEYS)
 
-    return {
+    # One encode, one buffered write
+    with open(snapshot_path, "wb", buffering=1 << 20) as f:
+        f.write(data)
+
+    result = {
         "status": "ok",
         "snapshot_id": snapshot_id,
         "trigger": safe_trigger,
@@ -79,3 +133,73 @@ def create_snapshot(trigger: str, extra: dict | None = None) -> dict:
         "path": str(snapshot_path),
         "counts": snapshot["counts"],
     }
+
+    with open(SNAPSHOT_INDEX, "ab") as f:
+        f.write(orjson.dumps({
+            "snapshot_id": snapshot_id,
+            "created_at": created_at,
+            "trigger": safe_trigger,
+            "format": format,
+            "mode": mode,
+            "path": str(snapshot_path),
+            "counts": snapshot["counts"],
+        }) + b"\n")
+
+    return result
+
+
+def list_snapshots() -> list[dict]:
+    """
+    List snapshot metadata from the index without opening any snapshot.
+    """
+    if not SNAPSHOT_INDEX.exists():
+        return []
+
+    with open(SNAPSHOT_INDEX, "rb") as f:
+        return [orjson.loads(line) for line in f if line.strip()]
+
+
+def _read_snapshot(entry: dict) -> dict:
+    raw = Path(entry["path"]).read_bytes()
+    if entry.get("format") == "msgpack":
+        import msgpack
+
+        return msgpack.unpackb(raw, raw=False)
+    return orjson.loads(raw)
+
+
+def _latest_state_snapshot() -> dict | None:
+    """
+    Index entry of the newest snapshot that carries state (full or diff).
+    """
+    for entry in reversed(list_snapshots()):
+        if entry.get("mode", "full") != "counts":
+            return entry
+    return None
+
+
+def load_snapshot_state(snapshot_id: str) -> dict:
+    """
+    Rebuild the full state recorded by a snapshot, replaying the diff
+    chain back to the nearest full snapshot.
+    """
+    by_id = {e["snapshot_id"]: e for e in list_snapshots()}
+    if snapshot_id not in by_id:
+        raise KeyError(f"Unknown snapshot: {snapshot_id}")
+
+    chain = []
+    snapshot = _read_snapshot(by_id[snapshot_id])
+    while "patch" in snapshot:
+        chain.append(snapshot["patch"])
+        snapshot = _read_snapshot(by_id[snapshot["base_snapshot_id"]])
+
+    if "state" not in snapshot:
+        raise ValueError(f"Snapshot {snapshot['snapshot_id']} has no state (counts-only)")
+
+    state = snapshot["state"]
+    if chain:
+        import jsonpatch
+
+        for patch in reversed(chain):
+            state = jsonpatch.apply_patch(state, patch)
+    return state
@@ -0,0 +1,198 @@
+"""
+Optional SQLite store for the append-only sections of cognition state.
+
+Enabled with FH_STATE_DB=1. When enabled, action_log and perception.inputs
+live in state/cognition.db (WAL mode) instead of cognition_state.json, so
+appending one entry writes one row instead of rewriting the whole file.
+state_manager merges the rows back in on load, so callers still see one
+state dict.
+
+Only append-only sections belong here. perception.signals is replaced
+wholesale by extraction and stays in the JSON file.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import orjson
+
+DB_PATH = Path("state/cognition.db")
+
+ENABLED = os.getenv("FH_STATE_DB", "0") == "1"
+
+# table -> (state section, key) it backs
+TABLES = {
+    "action_log": ("state_mutations", "action_log"),
+    "inputs": ("perception", "inputs"),
+}
+
+_CONN = None
+_LOCK = threading.Lock()
+
+
+# ─────────────────────────────────────────────
+# Connection
+# ─────────────────────────────────────────────
+
+def _conn():
+    global _CONN
+
+    if _CONN is None:
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(DB_PATH, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for table in TABLES:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(seq INTEGER PRIMARY KEY AUTOINCREMENT, payload BLOB NOT NULL)"
+            )
+        _CONN = conn
+
+    return _CONN
+
+
+def close():
+    global _CONN
+
+    with _LOCK:
+        if _CONN is not None:
+            _CONN.close()
+            _CONN = None
+
+
+# ─────────────────────────────────────────────
+# Rows
+# ─────────────────────────────────────────────
+
+@contextmanager
+def _write():
+    """
+    One write transaction. BEGIN IMMEDIATE takes the write lock up front,
+    so a concurrent writer waits instead of failing midway.
+    """
+    with _LOCK:
+        conn = _conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+
+def _insert(conn, table, entries):
+    conn.executemany(
+        f"INSERT INTO {table} (payload) VALUES (?)",
+        [(orjson.dumps(e),) for e in entries],
+    )
+
+
+def append(table, entry):
+    append_many(table, [entry])
+
+
+def append_many(table, entries):
+    if not entries:
+        return
+
+    with _write() as conn:
+        _insert(conn, table, entries)
+
+
+class Rows(list):
+    """
+    A DB-backed section as loaded: `loaded` entries were read, up to row
+    `seq`. Anything past `loaded` was appended in memory since.
+    """
+
+    loaded = 0
+    seq = 0
+
+
+def rows(table):
+    with _LOCK:
+        cur = _conn().execute(f"SELECT seq, payload FROM {table} ORDER BY seq")
+        out = Rows()
+        for seq, payload in cur:
+            out.append(orjson.loads(payload))
+            out.seq = seq
+        out.loaded = len(out)
+        return out
+
+
+def version():
+    """
+    Cheap change marker: the last row id of every table.
+    """
+    with _LOCK:
+        conn = _conn()
+        return tuple(
+            conn.execute(f"SELECT max(seq) FROM {table}").fetchone()[0]
+            for table in TABLES
+        )
+
+
+# ─────────────────────────────────────────────
+# State merge / split
+# ─────────────────────────────────────────────
+
+def attach(state):
+    """
+    Fill the DB-backed sections of a freshly parsed state.
+
+    The file keeps these sections empty once migrated; entries there were
+    written with the store off and are not in the database. Merging them
+    silently could reorder or duplicate the log, so refuse instead.
+    """
+    for table, (section, key) in TABLES.items():
+        if state[section][key]:
+            raise RuntimeError(
+                f"{section}.{key} has {len(state[section][key])} entries in the "
+                f"state file that are not in {DB_PATH}; move them into the "
+                "database or unset FH_STATE_DB"
+            )
+        state[section][key] = rows(table)
+    return state
+
+
+def detach(state):
+    """
+    Move new entries into the database and return a copy of state
+    without the DB-backed sections, ready to be written as JSON.
+
+    All tables are written in one transaction. A section read through
+    attach() contributes only what was appended after it was loaded. A
+    plain list (state parsed straight from JSON) is a migration, which is
+    only safe into an empty table.
+    """
+    out = dict(state)
+    with _write() as conn:
+        for table, (section, key) in TABLES.items():
+            entries = state.get(section, {}).get(key, [])
+            last = conn.execute(f"SELECT max(seq) FROM {table}").fetchone()[0] or 0
+
+            if isinstance(entries, Rows):
+                if len(entries) < entries.loaded:
+                    raise RuntimeError(f"{table} is append-only, but entries were removed")
+                if last < entries.seq:
+                    raise RuntimeError(f"{table} lost rows since this state was loaded")
+                new = entries[entries.loaded:]
+            elif last:
+                raise RuntimeError(f"{table} already has rows; refusing to migrate over them")
+            else:
+                new = entries
+
+            _insert(conn, table, new)
+            out[section] = {**state.get(section, {}), key: []}
+
+    # Saved now: a later save of this same state must not insert them again
+    for table, (section, key) in TABLES.items():
+        entries = state.get(section, {}).get(key)
+        if isinstance(entries, Rows):
+            entries.loaded = len(entries)
+    return out
@@ -1,50 +1,385 @@
 """
 State manager for cognition_state.json
+
+FH_STATE_FORMAT=msgpack stores the same document as
+state/cognition_state.msgpack instead (smaller, faster to parse). The
+JSON file is converted on first load and left in place.
+
+FH_STATE_DB=1 moves the two append-only sections, action_log and
+perception.inputs, into state/cognition.db (see engine.state_db). The
+database is then the only copy of those entries: the state file keeps
+both lists empty and every load merges the rows back in. Everything else
+still lives in the state file. Entries that reach the file while the
+flag is off are not merged; loading refuses to run until they are
+reconciled.
 """
 
-import json
+import mmap
+import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from datetime import datetime
-
-STATE_PATH = Path("state/cognition_state.json")
+from datetime import datetime, timezone
+
+import orjson
+
+try:
+    import simdjson  # optional: lazy subtree reads of large JSON state
+except ImportError:
+    simdjson = None
+
+from engine import state_db
+
+__all__ = [
+    "STATE_PATH",
+    "BASELINE_SCHEMA",
+    "ADVISORY_STATUSES",
+    "load_state",
+    "read_state",
+    "save_state",
+    "state_transaction",
+    "utc_now_iso",
+    "warm_cache",
+    "state_version",
+    "get_active_project_id",
+    "set_active_project_id",
+    "get_kb_drafts",
+    "append_kb_scaffold",
+    "get_advisories",
+    "update_advisory_status",
+    "append_input",
+    "get_inputs",
+    "get_intel_signals",
+    "replace_intel_signals",
+    "get_kb_candidates",
+    "get_projects",
+    "append_action",
+    "append_actions",
+    "get_action_log",
+    "get_action_log_page",
+]
+
+JSON_STATE_PATH = Path("state/cognition_state.json")
+
+# Durable encoding: "json" (default) or "msgpack"
+STATE_FORMAT = os.getenv("FH_STATE_FORMAT", "json")
+
+STATE_PATH = (
+    Path("state/cognition_state.msgpack") if STATE_FORMAT == "msgpack"
+    else JSON_STATE_PATH
+)
+
+# Last bytes read from / written to STATE_PATH, keyed by file (mtime, size).
+# The file stays the source of truth: any change on disk invalidates it.
+_CACHE = {"key": None, "raw": None, "state": None, "db_version": None, "sections": {}}
+
+# Set once the optional SQLite store has been checked / migrated
+_DB_READY = False
+
+# Serializes read-modify-write cycles within this process (re-entrant, so
+# a transaction may call helpers that open their own)
+_TXN_LOCK = threading.RLock()
+
+# State of the transaction open on this thread, if any
+_TXN_LOCAL = threading.local()
+
+# Guards _CACHE refreshes, so a reader never pins a stale parse under a
+# newer file key (re-entrant: the getters nest)
+_CACHE_LOCK = threading.RLock()
+
+# Files at least this large are mapped read-only instead of copied in
+_MMAP_MIN_BYTES = 1 << 20
+
+# Compact JSON on disk by default; FH_PRETTY_STATE=1 indents for humans
+PRETTY_STATE = os.getenv("FH_PRETTY_STATE", "0") == "1"
+
+# fsync each save before the swap; FH_SKIP_FSYNC=1 skips it for dev loops
+SKIP_FSYNC = os.getenv("FH_SKIP_FSYNC", "0") == "1"
 
 
 # ─────────────────────────────────────────────
 # Core Load / Save
 # ─────────────────────────────────────────────
 
-def load_state():
-    if not STATE_PATH.exists():
-        raise FileNotFoundError("Cognition state not initialized.")
-
-    with open(STATE_PATH, "r") as f:
-        state = json.load(f)
-
-    # Ensure required top-level keys exist
-    state.setdefault("focus", {"active_project_id": None})
-    state.setdefault("kb_drafts", {
-        "scaffolded": [],
-        "active": [],
-        "archived": []
-    })
-    state.setdefault("advisories", {
-        "open": [],
-        "resolved": [],
-        "dismissed": []
-    })
-    state.setdefault("meta", {})
+# Every section the helpers below rely on. Applied once per parse, so
+# individual helpers can index straight into the state.
+BASELINE_SCHEMA = {
+    "perception": {"inputs": [], "signals": []},
+    "proposals": {"kb_candidates": [], "project_candidates": []},
+    "decisions": {"approved": [], "rejected": []},
+    "state_mutations": {"projects": [], "kb": [], "action_log": []},
+    "focus": {"active_project_id": None},
+    "kb_drafts": {"scaffolded": [], "active": [], "archived": []},
+    "advisories": {"by_id": {}},
+    "meta": {},
+}
+
+
+def _ensure(target, schema):
+    for key, default in schema.items():
+        if key not in target:
+            # Fresh container per state; never share the schema's own
+            target[key] = _ensure({}, default) if isinstance(default, dict) else (
+                type(default)() if isinstance(default, list) else default
+            )
+        elif isinstance(default, dict) and isinstance(target[key], dict):
+            _ensure(target[key], default)
+    return target
+
+
+def _with_defaults(state):
+    _ensure(state, BASELINE_SCHEMA)
+    _migrate_advisories(state["advisories"])
+    return state
+
+
+ADVISORY_STATUSES = ("open", "resolved", "dismissed")
+
+
+def _migrate_advisories(advisories):
+    # Older states keep one list per status; fold them into by_id
+    for status in ADVISORY_STATUSES:
+        for advisory in advisories.pop(status, ()):
+            advisories["by_id"][advisory["id"]] = {**advisory, "status": status}
+
+
+def _use_db():
+    """
+    True when append-only sections live in state_db (FH_STATE_DB=1).
+
+    The first call against a new database moves any entries still held
+    in the JSON file into it.
+    """
+    global _DB_READY
+
+    if not state_db.ENABLED:
+        return False
+
+    if not _DB_READY:
+        _DB_READY = True
+        if not state_db.DB_PATH.exists() and STATE_PATH.exists():
+            # Parse without attach: the JSON entries are what migrates
+            save_state(_with_defaults(_decode(STATE_PATH.read_bytes())))
+
+    return True
+
+
+def _decode(buf):
+    if STATE_FORMAT == "msgpack":
+        import msgpack  # optional: only needed for FH_STATE_FORMAT=msgpack
+
+        return msgpack.unpackb(buf, raw=False)
+    return orjson.loads(buf)
+
+
+def _encode(state):
+    if STATE_FORMAT == "msgpack":
+        import msgpack
+
+        return msgpack.packb(state, use_bin_type=True)
+    return orjson.dumps(state, option=orjson.OPT_INDENT_2 if PRETTY_STATE else 0)
+
+
+def _file_key(st):
+    # Size guards against same-tick rewrites on coarse-mtime filesystems
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _raw_state():
+    """
+    Current file contents: bytes, or a read-only mmap for large files.
+
+    A mapping keeps pointing at the file it was opened on, so it stays
+    a consistent view even after save_state swaps in a new file.
+    """
+    with _CACHE_LOCK:
+        _use_db()  # any migration rewrites the file before it is read
+
+        if not STATE_PATH.exists():
+            if STATE_PATH == JSON_STATE_PATH or not JSON_STATE_PATH.exists():
+                raise FileNotFoundError("Cognition state not initialized.")
+            # First run in msgpack mode: convert the existing JSON state
+            save_state(_with_defaults(orjson.loads(JSON_STATE_PATH.read_bytes())))
 
+        if _CACHE["key"] != _file_key(os.stat(STATE_PATH)):
+            with open(STATE_PATH, "rb") as f:
+                st = os.fstat(f.fileno())
+                if st.st_size >= _MMAP_MIN_BYTES:
+                    raw = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    raw = f.read()
+
+            _CACHE["raw"] = raw
+            _CACHE["state"] = None
+            _CACHE["sections"] = {}
+            _CACHE["key"] = _file_key(st)
+
+        return _CACHE["raw"]
+
+
+def _parse(raw):
+    if isinstance(raw, mmap.mmap):
+        with memoryview(raw) as view:
+            state = _with_defaults(_decode(view))
+    else:
+        state = _with_defaults(_decode(raw))
+
+    if _use_db():
+        state_db.attach(state)
     return state
 
 
-def save_state(state):
+def _cached_state():
+    """
+    Shared parsed state for read-only getters. Never mutate the result.
+    """
+    with _CACHE_LOCK:
+        raw = _raw_state()
+        if _use_db():
+            db_version = state_db.version()
+            if _CACHE["db_version"] != db_version:
+                _CACHE["state"] = None
+                _CACHE["db_version"] = db_version
+        if _CACHE["state"] is None:
+            _CACHE["state"] = _parse(raw)
+        return _CACHE["state"]
+
+
+def _cached_section(section, key):
+    """
+    One list from the cached state. For large (mapped) JSON files with
+    simdjson installed, only that subtree is parsed until something needs
+    the whole document. Never mutate the result.
+    """
+    with _CACHE_LOCK:
+        raw = _raw_state()
+
+        lazy = (
+            simdjson is not None
+            and _CACHE["state"] is None
+            and STATE_FORMAT == "json"
+            and isinstance(raw, mmap.mmap)
+            and not (_use_db() and (section, key) in state_db.TABLES.values())
+        )
+        if not lazy:
+            return _cached_state()[section][key]
+
+        sections = _CACHE["sections"]
+        if (section, key) not in sections:
+            view = memoryview(raw)
+            doc = simdjson.Parser().parse(view)
+            try:
+                sections[(section, key)] = doc.at_pointer(f"/{section}/{key}").as_list()
+            except KeyError:
+                sections[(section, key)] = []
+            finally:
+                del doc
+                view.release()
+        return sections[(section, key)]
+
+
+def warm_cache():
+    """
+    Parse the state into the read cache now (e.g. before a preforking
+    server forks, so workers start with it). No-op if there is no state yet.
+    """
+    try:
+        _cached_state()
+    except FileNotFoundError:
+        pass
+
+
+def state_version():
+    """
+    Opaque marker that changes whenever the persisted state does. Costs a
+    stat (plus a row-id query with FH_STATE_DB=1); nothing is parsed.
+    """
+    with _CACHE_LOCK:
+        db = _use_db()  # may migrate (rewrite the file) on first use
+        _raw_state()
+        key = _CACHE["key"]
+        if db:
+            key += state_db.version()
+        return "-".join(str(k) for k in key)
+
+
+def load_state():
+    """
+    Return a private, mutable copy of the current state.
+    """
+    return _parse(_raw_state())
+
+
+def read_state():
+    """
+    The shared parsed state, for read-only callers. Never mutate the result;
+    use load_state() or state_transaction() to change state.
+    """
+    return _cached_state()
+
+
+def utc_now_iso():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def save_state(state, now_iso=None):
+    """
+    Persist state. Pass `now_iso` to stamp a batch of work with one time.
+    """
     state.setdefault("meta", {})
-    state["meta"]["last_updated"] = datetime.utcnow().isoformat()
+    state["meta"]["last_updated"] = now_iso or utc_now_iso()
 
     STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(STATE_PATH, "w") as f:
-        json.dump(state, f, indent=2)
+    if _use_db():
+        state = state_db.detach(state)
+
+    raw = _encode(state)
+
+    # Write aside, then atomically swap in: readers never see a torn file,
+    # and a crash never leaves a truncated one
+    tmp = STATE_PATH.with_name(STATE_PATH.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(raw)
+        if not SKIP_FSYNC:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, STATE_PATH)
+
+    with _CACHE_LOCK:
+        _CACHE["raw"] = raw
+        _CACHE["state"] = None
+        _CACHE["sections"] = {}
+        _CACHE["key"] = _file_key(os.stat(STATE_PATH))
+
+
+@contextmanager
+def state_transaction(now_iso=None):
+    """
+    Load once, let the caller mutate freely, save once on success.
+    Concurrent transactions in this process run one at a time; a nested
+    transaction shares the outer state and leaves saving to it.
+
+        with state_transaction() as state:
+            state["perception"]["signals"].append(signal)
+    """
+    with _TXN_LOCK:
+        outer = getattr(_TXN_LOCAL, "state", None)
+        if outer is not None:
+            yield outer
+            return
+
+        state = _TXN_LOCAL.state = load_state()
+        try:
+            yield state
+            save_state(state, now_iso)
+        finally:
+            _TXN_LOCAL.state = None
+
+
+def _direct_db_append():
+    # Row inserts bypass the JSON only when no transaction holds the state
+    return _use_db() and getattr(_TXN_LOCAL, "state", None) is None
 
 
 # ─────────────────────────────────────────────
@@ -52,15 +387,13 @@ def save_state(state):
 # ─────────────────────────────────────────────
 
 def get_active_project_id():
-    state = load_state()
+    state = _cached_state()
     return state.get("focus", {}).get("active_project_id")
 
 
 def set_active_project_id(project_id):
-    state = load_state()
-    state.setdefault("focus", {})
-    state["focus"]["active_project_id"] = project_id
-    save_state(state)
+    with state_transaction() as state:
+        state["focus"]["active_project_id"] = project_id
 
 
 # ─────────────────────────────────────────────
@@ -68,15 +401,52 @@ def set_active_project_id(project_id):
 # ─────────────────────────────────────────────
 
 def get_kb_drafts():
-    state = load_state()
+    state = _cached_state()
     return state.get("kb_drafts", {})
 
 
 def append_kb_scaffold(scaffold):
-    state = load_state()
-    state.setdefault("kb_drafts", {}).setdefault("scaffolded", [])
-    state["kb_drafts"]["scaffolded"].append(scaffold)
-    save_state(state)
+    with state_transaction() as state:
+        state["kb_drafts"]["scaffolded"].append(scaffold)
+
+
+# ─────────────────────────────────────────────
+# Advisory Layer
+# ─────────────────────────────────────────────
+
+def get_advisories():
+    """
+    Advisories grouped by status: {"open": [...], "resolved": [...], ...}
+    """
+    state = _cached_state()
+    grouped = {status: [] for status in ADVISORY_STATUSES}
+    for advisory in state["advisories"]["by_id"].values():
+        grouped.setdefault(advisory.get("status", "open"), []).append(advisory)
+    return grouped
+
+
+def update_advisory_status(advisory_id, status, now_iso=None):
+    """
+    Move one advisory to `status` and log the change in the same save.
+    """
+    if status not in ADVISORY_STATUSES:
+        raise ValueError(f"Invalid advisory status: {status}. Must be one of {ADVISORY_STATUSES}")
+
+    now_iso = now_iso or utc_now_iso()
+    with state_transaction(now_iso) as state:
+        advisory = state["advisories"]["by_id"].get(advisory_id)
+        if advisory is None:
+            raise KeyError(f"Unknown advisory: {advisory_id}")
+
+        state["state_mutations"]["action_log"].append({
+            "action_type": "advisory_status",
+            "advisory_id": advisory_id,
+            "from_status": advisory.get("status", "open"),
+            "to_status": status,
+            "timestamp": now_iso,
+        })
+        advisory["status"] = status
+    return advisory
 
 
 # ─────────────────────────────────────────────
@@ -84,14 +454,17 @@ def append_kb_scaffold(scaffold):
 # ─────────────────────────────────────────────
 
 def append_input(input_object):
-    state = load_state()
-    state.setdefault("perception", {}).setdefault("inputs", [])
-    state["perception"]["inputs"].append(input_object)
-    save_state(state)
+    with _TXN_LOCK:
+        if _direct_db_append():
+            state_db.append("inputs", input_object)
+            return
+
+        with state_transaction() as state:
+            state["perception"]["inputs"].append(input_object)
 
 
 def get_inputs():
-    state = load_state()
+    state = _cached_state()
     return state.get("perception", {}).get("inputs", [])
 
 
@@ -100,15 +473,12 @@ def get_inputs():
 # ─────────────────────────────────────────────
 
 def get_intel_signals():
-    state = load_state()
-    return state.get("perception", {}).get("signals", [])
+    return _cached_section("perception", "signals")
 
 
 def replace_intel_signals(signals):
-    state = load_state()
-    state.setdefault("perception", {})
-    state["perception"]["signals"] = signals
-    save_state(state)
+    with state_transaction() as state:
+        state["perception"]["signals"] = signals
 
 
 # ─────────────────────────────────────────────
@@ -116,13 +486,11 @@ def replace_intel_signals(signals):
 # ─────────────────────────────────────────────
 
 def get_kb_candidates():
-    state = load_state()
-    return state.get("proposals", {}).get("kb_candidates", [])
+    return _cached_section("proposals", "kb_candidates")
 
 
 def get_projects():
-    state = load_state()
-    return state.get("state_mutations", {}).get("projects", [])
+    return _cached_section("state_mutations", "projects")
 
 
 # ─────────────────────────────────────────────
@@ -130,12 +498,42 @@ def get_projects():
 # ─────────────────────────────────────────────
 
 def append_action(action_entry):
-    state = load_state()
-    state.setdefault("state_mutations", {}).setdefault("action_log", [])
-    state["state_mutations"]["action_log"].append(action_entry)
-    save_state(state)
+    with _TXN_LOCK:
+        if _direct_db_append():
+            state_db.append("action_log", action_entry)
+            return
+
+        with state_transaction() as state:
+            state["state_mutations"]["action_log"].append(action_entry)
+
+
+def append_actions(action_entries):
+    """
+    Append several action log entries with a single save (or one DB
+    insert batch).
+    """
+    with _TXN_LOCK:
+        if _direct_db_append():
+            state_db.append_many("action_log", action_entries)
+            return
+
+        with state_transaction() as state:
+            state["state_mutations"]["action_log"].extend(action_entries)
 
 
 def get_action_log():
-    state = load_state()
+    state = _cached_state()
     return state.get("state_mutations", {}).get("action_log", [])
+
+
+def get_action_log_page(limit, before=None):
+    """
+    Up to `limit` entries ending just before log position `before` (the
+    end of the log by default), in log order, plus the position of the
+    first one: pass it back as `before` for the next older page. The log
+    is append-only, so positions never shift.
+    """
+    log = get_action_log()
+    end = len(log) if before is None else max(0, min(before, len(log)))
+    start = max(0, end - limit)
+    return log[start:end], start
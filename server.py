@@ -1,20 +1,250 @@
-from flask import Flask, request, jsonify
+import functools
+import gzip
+import os
+import re
+import uuid
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+import orjson
+from flask import Flask, abort, request, jsonify
+from flask.json.provider import JSONProvider
+
+try:
+    import brotli  # optional: preferred over gzip when the client accepts br
+except ImportError:
+    brotli = None
+
 from engine.review.ReviewEngineAdapter import ReviewEngineAdapter
 from engine.draft_work_log import create_draft, DRAFT_WORK_LOG
-from engine.state_manager import load_state, append_action, get_action_log, get_intel_signals
-from engine.signal_extractor import run_signal_extraction
+from engine.llm_adapter import OLLAMA_KEEP_ALIVE, SESSION as _OLLAMA_SESSION, cached_response
+from engine.state_manager import (
+    read_state,
+    append_action,
+    append_actions,
+    get_action_log,
+    get_action_log_page,
+    get_advisories,
+    get_intel_signals,
+    get_kb_candidates,
+    get_projects,
+    state_version,
+    update_advisory_status,
+    warm_cache,
+)
+from engine.signal_extractor import apply_signals, extract_signals
 from engine.kb_draft_generator import run_kb_draft_generation
-from engine.proposal_generator import run_proposal_generation
-from engine.state_manager import get_kb_candidates, get_projects
+from engine.proposal_generator import apply_proposals, plan_proposals, run_proposal_generation
 
+class OrjsonProvider(JSONProvider):
+    """
+    jsonify / request.get_json backed by orjson instead of stdlib json
+    """
 
-import uuid
-
+    # Compact, insertion-ordered output regardless of debug mode (unlike
+    # DefaultJSONProvider, which indents in debug and can sort keys)
+    compact = True
+    sort_keys = False
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            self.option |= orjson.OPT_SORT_KEYS
+        if not self.compact:
+            self.option |= orjson.OPT_INDENT_2
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand the encoded bytes straight to the response (no str round trip)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, option=self.option),
+            mimetype="application/json",
+        )
 
-from engine.coach.run import run_coach_mode
-from engine.state_manager import get_intel_signals, append_action, get_action_log
 
 app = Flask(__name__, static_folder="ui", static_url_path="/ui")
+app.json = OrjsonProvider(app)
+
+# Flask debug mode (interactive debugger) only when FH_DEV=1
+DEV = os.getenv("FH_DEV", "0") == "1"
+
+# Write the cycle snapshot after responding (FH_ASYNC_SNAPSHOT=1); the
+# response then carries its id, pollable at /api/snapshot/<id>
+ASYNC_SNAPSHOT = os.getenv("FH_ASYNC_SNAPSHOT", "0") == "1"
+
+
+# Fixed envelope heads for the versioned list endpoints; only the list
+# itself is encoded per request
+_INTEL_PREFIX = b'{"schema_version":"1.0","intel_events":'
+_KB_PREFIX = b'{"schema_version":"1.0","kb_opportunities":'
+_PROJECTS_PREFIX = b'{"schema_version":"1.0","projects":'
+_ACTIONS_PREFIX = b'{"schema_version":"1.0","actions":'
+
+
+def _json_body():
+    """
+    Request body parsed straight from the raw bytes. cache=False lets the
+    bytes go as soon as they are parsed instead of living on the request.
+    """
+    try:
+        return orjson.loads(request.get_data(cache=False))
+    except orjson.JSONDecodeError:
+        abort(400, description="Request body is not valid JSON")
+
+
+def _enveloped_response(prefix, items, **extra):
+    body = prefix + orjson.dumps(items, option=orjson.OPT_NON_STR_KEYS)
+    for key, value in extra.items():
+        body += b"," + orjson.dumps(key) + b":" + orjson.dumps(value)
+    return app.response_class(body + b"}", mimetype="application/json")
+
+
+# Encoded bodies by ETag, so every poller of one state version shares a
+# single encode. Cleared wholesale when full; stale versions just age out.
+_BODY_CACHE = {}
+_BODY_CACHE_MAX = 64
+
+
+def _etag(endpoint, query=""):
+    etag = f"{state_version()}-{endpoint}"
+    return f"{etag}-{query}" if query else etag
+
+
+def _render_cached(etag, render):
+    """
+    Response for render(), served from _BODY_CACHE when the body for this
+    ETag is already encoded. A fresh 200 body is cached for the next caller.
+    """
+    body = _BODY_CACHE.get(etag)  # one lookup: safe against a concurrent clear()
+    if body is not None:
+        return app.response_class(body, mimetype="application/json")
+
+    response = render()
+    if response.status_code == 200 and not response.is_streamed:
+        if len(_BODY_CACHE) >= _BODY_CACHE_MAX:
+            _BODY_CACHE.clear()
+        _BODY_CACHE[etag] = response.get_data()
+    return response
+
+
+def _etagged(view):
+    """
+    Weak ETag from the state version: unchanged polls get a 304 without
+    touching the parsed state or encoding anything, and other clients
+    get the body already encoded for this version.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        etag = _etag(request.endpoint, request.query_string.decode("latin-1"))
+        if request.if_none_match.contains_weak(etag):
+            response = app.response_class(status=304)
+        else:
+            response = _render_cached(etag, lambda: view(*args, **kwargs))
+        response.set_etag(etag, weak=True)
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+    return wrapper
+
+
+# Lists longer than this are streamed in chunks of this many items
+_STREAM_CHUNK_ITEMS = 500
+
+
+def _stream_value(value):
+    if isinstance(value, dict):
+        yield from _stream_object(value)
+    elif isinstance(value, list) and len(value) > _STREAM_CHUNK_ITEMS:
+        sep = b"["
+        for i in range(0, len(value), _STREAM_CHUNK_ITEMS):
+            chunk = orjson.dumps(value[i:i + _STREAM_CHUNK_ITEMS], option=orjson.OPT_NON_STR_KEYS)
+            yield sep + chunk[1:-1]
+            sep = b","
+        yield b"]"
+    else:
+        yield orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _stream_object(obj):
+    """
+    Encode a dict one key at a time, descending into nested dicts and
+    splitting long lists (signals, action_log) into chunks, so the full
+    body is never held in memory at once.
+    """
+    sep = b"{"
+    for key, value in obj.items():
+        yield sep + orjson.dumps(key) + b":"
+        yield from _stream_value(value)
+        sep = b","
+    yield b"}" if sep == b"," else b"{}"
+
+
+# JSON bodies below this size go out uncompressed
+_COMPRESS_MIN_BYTES = 1024
+
+
+def _compress_stream(chunks, encoding):
+    """
+    Compress a streamed body chunk by chunk, keeping it streamed.
+    """
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=4)
+        compress, finish = compressor.process, compressor.finish
+    else:
+        compressor = zlib.compressobj(5, zlib.DEFLATED, 31)  # gzip container
+        compress, finish = compressor.compress, compressor.flush
+
+    for chunk in chunks:
+        out = compress(chunk)
+        if out:
+            yield out
+    yield finish()
+
+
+@app.after_request
+def _compress_json(response):
+    """
+    gzip (or Brotli, when installed and accepted) for large JSON bodies.
+    Streamed JSON (/api/state) is compressed incrementally.
+    """
+    if (
+        response.direct_passthrough
+        or response.mimetype != "application/json"
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+
+    if brotli is not None and "br" in request.accept_encodings:
+        encoding = "br"
+    elif "gzip" in request.accept_encodings:
+        encoding = "gzip"
+    else:
+        return response
+
+    if response.is_streamed:
+        response.response = _compress_stream(response.response, encoding)
+    else:
+        body = response.get_data()
+        if len(body) < _COMPRESS_MIN_BYTES:
+            return response
+        if encoding == "br":
+            response.set_data(brotli.compress(body, quality=4))
+        else:
+            response.set_data(gzip.compress(body, compresslevel=5))
+
+    response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    return response
+
+
 @app.route("/")
 def root():
     return app.send_static_file("index.html")
@@ -23,75 +253,128 @@ def root():
 
 
 
+# ─────────────────────────────────────────────
+# Snapshot API
+# ─────────────────────────────────────────────
+
+# One writer, so two snapshots never serialize state at the same time
+_SNAPSHOT_POOL = ThreadPoolExecutor(max_workers=1)
+
+# snapshot_id -> Future of snapshots written in the background (recent only)
+_SNAPSHOT_JOBS = OrderedDict()
+_SNAPSHOT_JOBS_MAX = 256
+
+
+def _submit_snapshot(create_snapshot, **kwargs):
+    snapshot_id = str(uuid.uuid4())
+    _SNAPSHOT_JOBS[snapshot_id] = _SNAPSHOT_POOL.submit(
+        create_snapshot, snapshot_id=snapshot_id, **kwargs
+    )
+    while len(_SNAPSHOT_JOBS) > _SNAPSHOT_JOBS_MAX:
+        _SNAPSHOT_JOBS.popitem(last=False)
+    return {"status": "pending", "snapshot_id": snapshot_id}
+
+
+@app.route("/api/snapshot/<snapshot_id>", methods=["GET"])
+def get_snapshot_status(snapshot_id):
+    job = _SNAPSHOT_JOBS.get(snapshot_id)
+    if job is not None:
+        if not job.done():
+            return jsonify({"status": "pending", "snapshot_id": snapshot_id}), 202
+        if job.exception() is not None:
+            return jsonify({
+                "status": "error",
+                "snapshot_id": snapshot_id,
+                "message": str(job.exception())
+            }), 500
+        return jsonify(job.result())
+
+    # Older (or synchronous) snapshots: look them up in the index
+    from engine.snapshot_manager import list_snapshots
+
+    for entry in list_snapshots():
+        if entry["snapshot_id"] == snapshot_id:
+            return jsonify({"status": "ok", **entry})
+    return jsonify({"error": "Not found"}), 404
+
+
 # ─────────────────────────────────────────────
 # Signal Extraction API
 # ─────────────────────────────────────────────
 @app.route("/api/run-signal-extraction", methods=["POST"])
 def run_extraction():
     try:
-        from engine.signal_extraction import run_signal_extraction
-        from engine.proposal_generator import run_proposal_generation
         from engine.snapshot_manager import create_snapshot
-        from engine.state_manager import load_state, save_state, append_action
+        from engine.state_manager import state_transaction, utc_now_iso
         from engine.advisory_generator import generate_advisories
         from engine.llm_adapter import call_llm
 
-        # 1️⃣ Run signal extraction
-        new_signals = run_signal_extraction()
-
-        # 2️⃣ Run proposal generation
-        run_proposal_generation(call_llm)
-
-        # 3️⃣ Load updated state
-        state = load_state()
-
-        project_candidates = state.get("proposals", {}).get("project_candidates", [])
-        kb_candidates = state.get("proposals", {}).get("kb_candidates", [])
-
-        state.setdefault("state_mutations", {}).setdefault("projects", [])
-        state.setdefault("state_mutations", {}).setdefault("kb", [])
-
-        # Prevent duplicate promotions
-        existing_source_ids = {
-            p.get("source_signal_id")
-            for p in state["state_mutations"]["projects"]
-        }
-
-        promoted_projects = []
-        promoted_kb = []
-
-        for project in project_candidates:
-            if project.get("source_signal_id") not in existing_source_ids:
-                state["state_mutations"]["projects"].append(project)
-                promoted_projects.append(project)
-
-        for kb in kb_candidates:
-            state["state_mutations"]["kb"].append(kb)
-            promoted_kb.append(kb)
+        # One timestamp for everything this cycle creates
+        now = utc_now_iso()
+
+        # 1️⃣ + 2️⃣ LLM stages on a snapshot, with no lock held, so other
+        # writers are not stuck behind a batch of model calls
+        snapshot_state = read_state()
+        extracted = extract_signals(snapshot_state, now)
+        planned, _ = plan_proposals(
+            call_llm,
+            snapshot_state,
+            now,
+            signals=snapshot_state["perception"]["signals"] + extracted,
+        )
 
-        # Clear proposals
-        state["proposals"]["project_candidates"] = []
-        state["proposals"]["kb_candidates"] = []
+        # One load, one save to merge the results; concurrent cycles queue
+        with state_transaction(now) as state:
+            new_signals = apply_signals(state, extracted)
+            apply_proposals(state, planned)
 
-        # 4️⃣ Generate advisories
-        new_advisories = generate_advisories(state)
+            project_candidates = state["proposals"]["project_candidates"]
+            kb_candidates = state["proposals"]["kb_candidates"]
 
-        # 5️⃣ Append lifecycle log
-        append_action({
-            "action_type": "signal_extraction_cycle",
-            "metadata": {
-                "signals_created": len(new_signals),
-                "projects_promoted": len(promoted_projects),
-                "kb_promoted": len(promoted_kb),
-                "advisories_created": len(new_advisories)
+            # Prevent duplicate promotions
+            existing_source_ids = {
+                p.get("source_signal_id")
+                for p in state["state_mutations"]["projects"]
             }
-        })
 
-        # 6️⃣ Save state
-        save_state(state)
-
-        # 7️⃣ Snapshot
-        snapshot = create_snapshot(
+            promoted_projects = []
+            promoted_kb = []
+
+            for project in project_candidates:
+                if project.get("source_signal_id") not in existing_source_ids:
+                    state["state_mutations"]["projects"].append(project)
+                    promoted_projects.append(project)
+
+            promoted_kb.extend(kb_candidates)
+            state["state_mutations"]["kb"].extend(kb_candidates)
+
+            # Clear proposals
+            state["proposals"]["project_candidates"] = []
+            state["proposals"]["kb_candidates"] = []
+
+            # 3️⃣ Generate advisories. Inline on purpose: it is CPU-only
+            # work over the projects just promoted, so a worker thread
+            # would add a handoff and gain nothing. The cycle's waiting
+            # already overlaps elsewhere: the LLM calls above fan out over
+            # threads, and FH_ASYNC_SNAPSHOT writes the snapshot after
+            # responding.
+            new_advisories = generate_advisories(state, now)
+
+            # 4️⃣ Append lifecycle log (saved with the rest of the cycle)
+            state["state_mutations"]["action_log"].append({
+                "action_type": "signal_extraction_cycle",
+                "timestamp": now,
+                "metadata": {
+                    "signals_created": len(new_signals),
+                    "projects_promoted": len(promoted_projects),
+                    "kb_promoted": len(promoted_kb),
+                    "advisories_created": len(new_advisories)
+                }
+            })
+
+        # 5️⃣ Snapshot (of the state just saved; no re-read)
+        snapshot_args = dict(
+            state=state,
             trigger="signal_extraction_cycle",
             extra={
                 "signals_created": len(new_signals),
@@ -100,6 +383,10 @@ def run_extraction():
                 "advisories_created": len(new_advisories)
             }
         )
+        if ASYNC_SNAPSHOT:
+            snapshot = _submit_snapshot(create_snapshot, **snapshot_args)
+        else:
+            snapshot = create_snapshot(**snapshot_args)
 
         return jsonify({
             "status": "ok",
@@ -117,60 +404,75 @@ def run_extraction():
         }), 500
 
 @app.route("/api/kb-drafts", methods=["GET"])
+@_etagged
 def get_kb_drafts_api():
     from engine.state_manager import get_kb_drafts
     return jsonify(get_kb_drafts())
 
 
 @app.route("/api/state", methods=["GET"])
+@_etagged
 def get_state():
-    return jsonify(load_state())
-
-@app.route("/api/action", methods=["POST"])
-def add_action():
-    data = request.json
-    append_action(data)
-    return jsonify({"status": "ok"})
-
-@app.route("/api/action-log", methods=["GET"])
-def action_log():
-    return jsonify({
-        "schema_version": "1.0",
-        "actions": get_action_log()
-    })
+    return app.response_class(_stream_object(read_state()), mimetype="application/json")
 
 @app.route("/api/kb", methods=["GET"])
+@_etagged
 def get_kb():
-    return jsonify({
-        "schema_version": "1.0",
-        "kb_opportunities": get_kb_candidates()
-    })
+    return _enveloped_response(_KB_PREFIX, get_kb_candidates())
 
 @app.route("/api/projects", methods=["GET"])
+@_etagged
 def get_projects_api():
-    return jsonify({
-        "schema_version": "1.0",
-        "projects": get_projects()
-    })
-def get_kb_candidates():
-    state = load_state()
-    return state["proposals"]["kb_candidates"]
+    return _enveloped_response(_PROJECTS_PREFIX, get_projects())
 
-def get_projects():
-    state = load_state()
-    return state["state_mutations"]["projects"]
+# ─────────────────────────────────────────────
+# Advisory API
+# ─────────────────────────────────────────────
+@app.route("/api/advisories", methods=["GET"])
+@_etagged
+def get_advisories_api():
+    return jsonify(get_advisories())
+
+
+@app.route("/api/advisories/<advisory_id>/status", methods=["POST"])
+def set_advisory_status(advisory_id):
+    """
+    {"status": "resolved" | "dismissed" | "open"}: a human acting on an
+    advisory. The change is logged in the action log.
+    """
+    data = _json_body()
+    status = data.get("status") if isinstance(data, dict) else None
+    try:
+        advisory = update_advisory_status(advisory_id, status)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except KeyError:
+        return jsonify({"error": "Not found"}), 404
+    return jsonify({"status": "ok", "advisory": advisory})
 
 # ─────────────────────────────────────────────
 # Proposal Generation API
 # ─────────────────────────────────────────────
+# The last proposal run and the state version it left behind. With
+# FH_PROPOSAL_CACHE=1 a rerun against that exact version returns it
+# instead of fanning out to the LLM again; any save, by any writer,
+# moves the version on and so invalidates it.
+PROPOSAL_CACHE = os.getenv("FH_PROPOSAL_CACHE", "0") == "1"
+_LAST_PROPOSAL_RUN = (None, None)
+
+
 @app.route("/api/run-proposal-generation", methods=["POST"])
 def run_proposals():
-    try:
-        from engine.proposal_generator import run_proposal_generation
-        from engine.llm_adapter import generate_text  # adjust if needed
+    global _LAST_PROPOSAL_RUN
 
+    try:
         from engine.llm_adapter import call_llm
 
+        if PROPOSAL_CACHE:
+            version, cached = _LAST_PROPOSAL_RUN
+            if version == state_version():
+                return jsonify({**cached, "cached": True})
+
         result = run_proposal_generation(call_llm)
 
 
@@ -178,6 +480,9 @@ def run_proposals():
         snapshot = create_snapshot("proposal_generation")
 
         result["snapshot"] = snapshot
+
+        if PROPOSAL_CACHE:
+            _LAST_PROPOSAL_RUN = (state_version(), result)
         return jsonify(result)
 
     except Exception as e:
@@ -206,14 +511,24 @@ def run_kb_generation():
 # ─────────────────────────────────────────────
 # Review API
 # ─────────────────────────────────────────────
+@functools.lru_cache(maxsize=8)
+def _review_engine(provider_name, persist, allow_claude):
+    # The adapter keeps no per-run state, so one instance per config is shared
+    return ReviewEngineAdapter(
+        provider_name=provider_name,
+        persist=persist,
+        allow_claude=allow_claude,
+    )
+
+
 @app.route("/api/review", methods=["POST"])
 def review():
-    data = request.get_json(force=True)
+    data = _json_body()
 
-    engine = ReviewEngineAdapter(
-        provider_name=data.get("provider", "ollama"),
-        persist=data.get("persist", True),
-        allow_claude=data.get("allow_claude", False),
+    engine = _review_engine(
+        str(data.get("provider", "ollama")),
+        bool(data.get("persist", True)),
+        bool(data.get("allow_claude", False)),
     )
 
     result = engine.run(
@@ -229,14 +544,60 @@ def get_draft(draft_id):
     if not draft:
         return jsonify({"error": "Not found"}), 404
 
-    return jsonify({
-        "draft_id": draft.draft_id,
-        "body": draft.content["body"],
-        "format": draft.content["format"],
-        "status": draft.status,
-        "tags": draft.tags,
-    })
+    # Only the status changes after creation, so it versions the ETag
+    etag = f"{draft.draft_id}-{draft.status}"
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(draft.to_json(), mimetype="application/json")
+    response.set_etag(etag, weak=True)
+    return response
+
+
+
+# ─────────────────────────────────────────────
+# Prompts (fixed text, built once at import)
+# ─────────────────────────────────────────────
+SYSTEM_IDENTITY = """
+You are Future Hause.
+
+Role:
+- You are an intelligence analyst + drafting assistant.
+- You observe signals, draft work entries, and organize knowledge.
+- You do NOT take autonomous action or execute commands.
+
+Reality / Safety:
+- Bitcoin mining is legal activity in many jurisdictions, including the U.S.
+- Do NOT claim bitcoin mining is illegal.
+- Only refuse if the user asks for explicitly illegal wrongdoing (fraud, hacking, violence, etc.).
+- Writing normal business emails is allowed.
 
+Company grounding:
+- FutureBit is a Bitcoin mining hardware company.
+- It builds home Bitcoin mining nodes (Apollo series).
+- It is NOT an AI semiconductor company.
+
+Epistemic constraints:
+- Use only the user’s message + existing system state.
+- Do NOT invent deployments, firmware releases, outages, or system logs.
+- If the user provides a clear topic, draft the email using reasonable professional defaults.
+- Only ask clarifying questions if the request is ambiguous or unsafe.
+
+""".strip()
+
+# Identical leading text on every /api/send call: with the model kept
+# resident (keep_alive), Ollama reuses its prefill instead of redoing it
+PROMPT_PREFIX = SYSTEM_IDENTITY + "\n\nUser Message:\n"
+
+COACH_PROMPT_PREFIX = """You are a professional writing coach.
+Improve clarity, tone, and structure.
+Do not invent new facts.
+
+Text:
+"""
+
+# /api/send routes a message to draft creation when it mentions a draft
+_DRAFT_RE = re.compile(r"draft", re.IGNORECASE)
 
 
 # ─────────────────────────────────────────────
@@ -245,14 +606,14 @@ def get_draft(draft_id):
 
 @app.route("/api/coach", methods=["POST"])
 def coach():
-    data = request.get_json(force=True)
+    data = _json_body()
 
     draft_id = data.get("draft_id")
     draft_text = data.get("draft_text")
 
     # If draft exists → use review engine
     if draft_id and draft_id in DRAFT_WORK_LOG:
-        engine = ReviewEngineAdapter(provider_name="ollama")
+        engine = _review_engine("ollama", True, False)
         result = engine.run(
             draft_id=draft_id,
             draft_text=draft_text,
@@ -261,14 +622,10 @@ def coach():
         return jsonify(result)
 
     # Otherwise → run direct coach LLM call
-    coach_prompt = f"""
-You are a professional writing coach.
-Improve clarity, tone, and structure.
-Do not invent new facts.
+    coach_prompt = COACH_PROMPT_PREFIX + (draft_text or "")
 
-Text:
-{draft_text}
-"""
+    if _wants_stream(data):
+        return _sse_response(coach_prompt)
 
     response = call_llm(coach_prompt)
 
@@ -278,97 +635,127 @@ Text:
     })
 
 
-import requests
-
 def call_llm(message: str) -> str:
     """
     Simple Ollama call.
     Can later swap to Claude, OpenAI, etc.
     """
-    try:
-        response = requests.post(
+    def generate():
+        response = _OLLAMA_SESSION.post(
             "http://127.0.0.1:11434/api/generate",
-            json={
+            data=orjson.dumps({
                 "model": "llama3.1:latest",
                 "prompt": message,
-                "stream": False
-            },
+                "stream": False,
+                "keep_alive": OLLAMA_KEEP_ALIVE
+            }),
+            headers={"Content-Type": "application/json"},
             timeout=60,
         )
 
-        data = response.json()
+        data = orjson.loads(response.content)
         return data.get("response", "")
 
+    try:
+        # Errors raise out of generate(), so they are never cached
+        return cached_response("llama3.1:latest", message, generate)
+
     except Exception as e:
         return f"[LLM ERROR] {str(e)}"
 
 
+def stream_llm(message: str):
+    """
+    Yield response text as Ollama generates it (NDJSON, one object per line).
+    """
+    with _OLLAMA_SESSION.post(
+        "http://127.0.0.1:11434/api/generate",
+        data=orjson.dumps({
+            "model": "llama3.1:latest",
+            "prompt": message,
+            "stream": True,
+            "keep_alive": OLLAMA_KEEP_ALIVE
+        }),
+        headers={"Content-Type": "application/json"},
+        timeout=60,
+        stream=True,
+    ) as response:
+        for line in response.iter_lines():
+            if not line:
+                continue
+            chunk = orjson.loads(line)
+            yield chunk.get("response", "")
+            if chunk.get("done"):
+                break
+
+
+def _wants_stream(payload):
+    # Opt-in, so JSON clients (the dashboard) are unaffected
+    return payload.get("stream") is True or (
+        request.accept_mimetypes.best_match(["application/json", "text/event-stream"])
+        == "text/event-stream"
+    )
+
+
+def _sse(event, data):
+    return b"event: " + event + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+def _sse_response(prompt, finish=None):
+    """
+    Server-Sent Events: a "token" event per chunk, then one "done" event
+    with the full response (plus whatever `finish(response)` returns).
+    """
+    def events():
+        parts = []
+        try:
+            for text in stream_llm(prompt):
+                if text:
+                    parts.append(text)
+                    yield _sse(b"token", {"text": text})
+        except Exception as e:
+            yield _sse(b"error", {"message": f"[LLM ERROR] {str(e)}"})
+            return
+
+        done = {"response": "".join(parts)}
+        if finish is not None:
+            done.update(finish(done["response"]))
+        yield _sse(b"done", done)
+
+    return app.response_class(
+        events(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
 
 @app.route("/api/send", methods=["POST"])
 def send():
-    payload = request.get_json(force=True)
+    payload = _json_body()
     message = payload["message"].strip()
     mode = payload.get("mode")
+    stream = _wants_stream(payload)
 
     if mode == "coach":
-        coach_prompt = f"""
-You are a professional writing coach.
-Improve clarity, tone, and structure.
-Do not invent new facts.
+        coach_prompt = COACH_PROMPT_PREFIX + message
 
-Text:
-{message}
-""".strip()
+        if stream:
+            return _sse_response(coach_prompt)
 
         response = call_llm(coach_prompt)
         return jsonify({"response": response})
 
     routing_decision = {
-        "intent": "draft_request" if "draft" in message.lower() else "general"
+        "intent": "draft_request" if _DRAFT_RE.search(message) else "general"
     }
 
+    final_prompt = PROMPT_PREFIX + message
 
-    SYSTEM_IDENTITY = """
-You are Future Hause.
-
-Role:
-- You are an intelligence analyst + drafting assistant.
-- You observe signals, draft work entries, and organize knowledge.
-- You do NOT take autonomous action or execute commands.
-
-Reality / Safety:
-- Bitcoin mining is legal activity in many jurisdictions, including the U.S.
-- Do NOT claim bitcoin mining is illegal.
-- Only refuse if the user asks for explicitly illegal wrongdoing (fraud, hacking, violence, etc.).
-- Writing normal business emails is allowed.
-
-Company grounding:
-- FutureBit is a Bitcoin mining hardware company.
-- It builds home Bitcoin mining nodes (Apollo series).
-- It is NOT an AI semiconductor company.
-
-Epistemic constraints:
-- Use only the user’s message + existing system state.
-- Do NOT invent deployments, firmware releases, outages, or system logs.
-- If the user provides a clear topic, draft the email using reasonable professional defaults.
-- Only ask clarifying questions if the request is ambiguous or unsafe.
-
-""".strip()
-
-    final_prompt = f"""
-{SYSTEM_IDENTITY}
+    def finish(llm_response):
+        if routing_decision["intent"] != "draft_request":
+            return {}
 
-User Message:
-{message}
-""".strip()
-
-    llm_response = call_llm(final_prompt)
-
-    response_payload = {
-        "response": llm_response
-    }
-
-    if routing_decision["intent"] == "draft_request":
         draft = create_draft(
             message_id=str(uuid.uuid4()),
             router_intent="draft_request",
@@ -377,8 +764,17 @@ User Message:
             created_by="agent",
             tags=[],
         )
+        return {"draft_id": draft.draft_id}
+
+    if stream:
+        return _sse_response(final_prompt, finish)
+
+    llm_response = call_llm(final_prompt)
 
-        response_payload["draft_id"] = draft.draft_id
+    response_payload = {
+        "response": llm_response
+    }
+    response_payload.update(finish(llm_response))
 
     return jsonify(response_payload)
 
@@ -388,11 +784,9 @@ User Message:
 # Intel API
 # ─────────────────────────────────────────────
 @app.route("/api/intel", methods=["GET"])
+@_etagged
 def get_intel():
-    return jsonify({
-        "schema_version": "1.0",
-        "intel_events": get_intel_signals()
-    })
+    return _enveloped_response(_INTEL_PREFIX, get_intel_signals())
 
 
 # ─────────────────────────────────────────────
@@ -400,18 +794,128 @@ def get_intel():
 # ─────────────────────────────────────────────
 @app.route("/api/action", methods=["POST"])
 def post_action():
-    data = request.get_json(force=True)
-    append_action(data)
+    data = _json_body()
+
+    # A list of entries is recorded with one state write
+    if isinstance(data, list):
+        append_actions(data)
+    else:
+        append_action(data)
     return jsonify({"status": "ok"})
 
 
+@app.route("/api/action/batch", methods=["POST"])
+def post_action_batch():
+    """
+    Client-side batching: {"actions": [...]} (or a bare list), one write.
+    """
+    data = _json_body()
+    entries = data.get("actions", []) if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        return jsonify({"status": "error", "message": "actions must be a list"}), 400
+
+    append_actions(entries)
+    return jsonify({"status": "ok", "recorded": len(entries)})
+
+
 @app.route("/api/action-log", methods=["GET"])
+@_etagged
 def get_action_log_endpoint():
-    return jsonify({
-        "schema_version": "1.0",
-        "actions": get_action_log()
-    })
+    """
+    Whole log by default. ?limit=N[&before=P] returns one page from the
+    tail instead, with next_before (null on the oldest page) as the cursor.
+    """
+    return _action_log_response(
+        request.args.get("limit", type=int),
+        request.args.get("before", type=int),
+    )
+
+
+def _action_log_response(limit=None, before=None):
+    if limit is None and before is None:
+        return _enveloped_response(_ACTIONS_PREFIX, get_action_log())
+
+    entries, start = get_action_log_page(max(1, limit or 100), before)
+    return _enveloped_response(_ACTIONS_PREFIX, entries, next_before=start or None)
+
+
+# ─────────────────────────────────────────────
+# Batch API
+# ─────────────────────────────────────────────
+
+# Read-only endpoints that may be bundled into one /api/batch call. They
+# all read the shared parsed state, so a batch costs one parse at most.
+# Each takes the sub-request's own params; the outer request's query
+# string and If-None-Match never apply.
+def _int_param(params, name):
+    try:
+        return int(params[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+_BATCH_READS = {
+    "/api/intel": ("get_intel", lambda params: get_intel.__wrapped__()),
+    "/api/kb": ("get_kb", lambda params: get_kb.__wrapped__()),
+    "/api/projects": ("get_projects_api", lambda params: get_projects_api.__wrapped__()),
+    "/api/action-log": ("get_action_log_endpoint", lambda params: _action_log_response(
+        _int_param(params, "limit"), _int_param(params, "before")
+    )),
+    "/api/kb-drafts": ("get_kb_drafts_api", lambda params: get_kb_drafts_api.__wrapped__()),
+    "/api/advisories": ("get_advisories_api", lambda params: get_advisories_api.__wrapped__()),
+}
+
+
+@app.route("/api/batch", methods=["POST"])
+def batch():
+    """
+    {"requests": [{"id": "...", "path": "/api/intel", "params": {...}, "etag": "..."}, ...]}
+      -> {"responses": [{"id": "...", "status": 200, "etag": "...", "body": {...}}, ...]}
+
+    Each part carries the same ETag as the matching GET. A sub-request
+    that sends back the current one gets {"status": 304} and no body, so
+    a poller re-downloads only the sections that changed.
+    """
+    data = _json_body()
+
+    parts = []
+    for sub in data.get("requests", []):
+        head = b'{"id":' + orjson.dumps(sub.get("id"))
+        entry = _BATCH_READS.get(sub.get("path"))
+        if entry is None:
+            body = orjson.dumps({"error": f"not batchable: {sub.get('path')}"})
+            parts.append(head + b',"status":404,"body":' + body + b"}")
+            continue
+
+        endpoint, read = entry
+        params = sub.get("params") or {}
+        etag = _etag(endpoint, urlencode(params))
+        head += b',"etag":' + orjson.dumps(etag)
+        if sub.get("etag") == etag:
+            parts.append(head + b',"status":304}')
+            continue
+
+        # Already-encoded JSON, shared with the GET endpoints' cache
+        body = _render_cached(etag, lambda: read(params)).get_data()
+        parts.append(head + b',"status":200,"body":' + body + b"}")
+
+    return app.response_class(
+        b'{"responses":[' + b",".join(parts) + b"]}",
+        mimetype="application/json",
+    )
+
+
+# Parse state once at import: under `gunicorn --preload` the worker
+# inherits the parsed cache from the master process.
+warm_cache()
 
 
+# Development server only (FH_DEV=1 enables the debugger). In production:
+#   gunicorn -w 1 -k gthread --threads 16 --preload -b 127.0.0.1:8000 server:app
+#
+# One worker process with threads: the handlers mostly wait on disk and
+# on Ollama, so a slow /api/send or /api/coach no longer stalls the
+# polling endpoints. Keep it to one process; state writes are serialized
+# by an in-process lock (state_manager.state_transaction).
 if __name__ == "__main__":
-    app.run(host="127.0.0.1", port=8000, debug=True, use_reloader=False)
+    app.run(host="127.0.0.1", port=8000, debug=DEV, use_reloader=False, threaded=True)
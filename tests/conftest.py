@@ -0,0 +1,41 @@
+import importlib
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def state_doc():
+    return {
+        "perception": {
+            "inputs": [],
+            "signals": [{"id": "sig-1", "category": "discussion", "summary": "s"}],
+        },
+        "proposals": {"kb_candidates": [], "project_candidates": []},
+        "decisions": {"approved": [], "rejected": []},
+        "state_mutations": {
+            "kb": [],
+            "projects": [{"id": "proj-1", "name": "p"}],
+            "action_log": [{"action": f"a{n}"} for n in range(5)],
+        },
+    }
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch, state_doc):
+    pytest.importorskip("flask")
+    pytest.importorskip("requests")
+
+    # state_manager resolves state/ against the working directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(str(REPO))
+    (tmp_path / "state").mkdir()
+    (tmp_path / "state" / "cognition_state.json").write_text(json.dumps(state_doc))
+
+    sys.modules.pop("server", None)
+    server = importlib.import_module("server")
+    return server.app.test_client()
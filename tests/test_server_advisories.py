@@ -0,0 +1,38 @@
+import pytest
+
+
+@pytest.fixture
+def state_doc(state_doc):
+    # Pre-by_id layout: one list per status
+    state_doc["advisories"] = {
+        "open": [{"id": "adv-1", "title": "t"}],
+        "resolved": [],
+        "dismissed": [{"id": "adv-2", "title": "u"}],
+    }
+    return state_doc
+
+
+def test_advisories_grouped_by_status(client):
+    body = client.get("/api/advisories").get_json()
+
+    assert [a["id"] for a in body["open"]] == ["adv-1"]
+    assert [a["id"] for a in body["dismissed"]] == ["adv-2"]
+    assert body["resolved"] == []
+
+
+def test_status_change_is_saved_and_logged(client):
+    r = client.post("/api/advisories/adv-1/status", json={"status": "resolved"})
+    assert r.status_code == 200
+
+    body = client.get("/api/advisories").get_json()
+    assert body["open"] == []
+    assert [a["id"] for a in body["resolved"]] == ["adv-1"]
+
+    last = client.get("/api/action-log?limit=1").get_json()["actions"][-1]
+    assert last["action_type"] == "advisory_status"
+    assert (last["advisory_id"], last["from_status"], last["to_status"]) == ("adv-1", "open", "resolved")
+
+
+def test_status_change_rejects_bad_input(client):
+    assert client.post("/api/advisories/adv-1/status", json={"status": "done"}).status_code == 400
+    assert client.post("/api/advisories/nope/status", json={"status": "open"}).status_code == 404
@@ -0,0 +1,53 @@
+def test_batch_returns_each_paths_own_body(client):
+    # Warm the per-endpoint body cache the way the dashboard's GETs would
+    client.get("/api/intel")
+
+    r = client.post(
+        "/api/batch",
+        json={"requests": [
+            {"id": "intel", "path": "/api/intel"},
+            {"id": "projects", "path": "/api/projects"},
+            {"id": "log", "path": "/api/action-log", "params": {"limit": 2}},
+        ]},
+        headers={"If-None-Match": 'W/"anything"'},
+    )
+
+    assert r.status_code == 200
+    bodies = {part["id"]: part["body"] for part in r.get_json()["responses"]}
+    assert bodies["intel"]["intel_events"][0]["id"] == "sig-1"
+    assert bodies["projects"]["projects"][0]["id"] == "proj-1"
+    assert bodies["intel"] != bodies["projects"]
+    assert [a["action"] for a in bodies["log"]["actions"]] == ["a3", "a4"]
+
+
+def test_batch_ignores_outer_etag(client):
+    etag = client.get("/api/intel").headers["ETag"]
+
+    r = client.post(
+        "/api/batch",
+        json={"requests": [{"id": "intel", "path": "/api/intel"}]},
+        headers={"If-None-Match": etag},
+    )
+
+    assert r.get_json()["responses"][0]["body"]["intel_events"]
+
+
+def test_batch_parts_revalidate_by_etag(client):
+    reads = [{"id": "intel", "path": "/api/intel"}, {"id": "log", "path": "/api/action-log"}]
+    first = client.post("/api/batch", json={"requests": reads}).get_json()["responses"]
+    etags = {part["id"]: part["etag"] for part in first}
+
+    # Same ETag as the plain GET
+    assert client.get("/api/intel").headers["ETag"] == f'W/"{etags["intel"]}"'
+
+    again = client.post("/api/batch", json={"requests": [
+        {**sub, "etag": etags[sub["id"]]} for sub in reads
+    ]}).get_json()["responses"]
+    assert [(part["status"], "body" in part) for part in again] == [(304, False), (304, False)]
+
+    client.post("/api/action", json={"action": "new"})
+    changed = client.post("/api/batch", json={"requests": [
+        {**sub, "etag": etags[sub["id"]]} for sub in reads
+    ]}).get_json()["responses"]
+    assert [part["status"] for part in changed] == [200, 200]
+    assert changed[1]["body"]["actions"][-1] == {"action": "new"}
@@ -0,0 +1,26 @@
+def test_unchanged_state_revalidates_with_304(client):
+    first = client.get("/api/projects")
+    etag = first.headers["ETag"]
+
+    again = client.get("/api/projects", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.get_data() == b""
+
+
+def test_state_change_invalidates_etag_and_body(client):
+    etag = client.get("/api/action-log").headers["ETag"]
+
+    client.post("/api/action", json={"action": "new"})
+
+    r = client.get("/api/action-log", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["ETag"] != etag
+    assert r.get_json()["actions"][-1] == {"action": "new"}
+
+
+def test_query_string_is_part_of_the_etag(client):
+    whole = client.get("/api/action-log")
+    page = client.get("/api/action-log?limit=2", headers={"If-None-Match": whole.headers["ETag"]})
+
+    assert page.status_code == 200
+    assert len(page.get_json()["actions"]) == 2
@@ -0,0 +1,53 @@
+import pytest
+
+
+@pytest.fixture
+def runs(client, monkeypatch):
+    import server
+    from engine import snapshot_manager, state_manager
+
+    calls = []
+
+    def fake_generation(llm_callable):
+        calls.append(1)
+        with state_manager.state_transaction():
+            pass  # a real run saves its proposals
+        return {"status": "complete", "run": len(calls)}
+
+    monkeypatch.setattr(server, "PROPOSAL_CACHE", True)
+    monkeypatch.setattr(server, "_LAST_PROPOSAL_RUN", (None, None))
+    monkeypatch.setattr(server, "run_proposal_generation", fake_generation)
+    monkeypatch.setattr(snapshot_manager, "create_snapshot", lambda trigger: {"id": trigger})
+    return calls
+
+
+def test_rerun_on_unchanged_state_is_cached(client, runs):
+    first = client.post("/api/run-proposal-generation").get_json()
+    second = client.post("/api/run-proposal-generation").get_json()
+
+    assert len(runs) == 1
+    assert second == {**first, "cached": True}
+
+
+def test_any_state_change_misses_the_cache(client, runs):
+    from engine import state_manager
+
+    client.post("/api/run-proposal-generation")
+
+    # Proposals are not signals or projects, but still change the outcome
+    with state_manager.state_transaction() as state:
+        state["proposals"]["kb_candidates"].append({"id": "kb-1"})
+
+    r = client.post("/api/run-proposal-generation").get_json()
+    assert len(runs) == 2
+    assert "cached" not in r
+
+
+def test_cache_is_off_by_default(client, runs, monkeypatch):
+    import server
+
+    monkeypatch.setattr(server, "PROPOSAL_CACHE", False)
+    client.post("/api/run-proposal-generation")
+    client.post("/api/run-proposal-generation")
+
+    assert len(runs) == 2
@@ -0,0 +1,75 @@
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+import orjson
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from engine import state_db, state_manager  # noqa: E402
+
+
+@pytest.fixture
+def db_state(tmp_path, monkeypatch):
+    # Both modules resolve state/ against the working directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(state_db, "ENABLED", True)
+    monkeypatch.setattr(state_db, "_CONN", None)
+    monkeypatch.setattr(state_manager, "_DB_READY", False)
+    monkeypatch.setitem(state_manager._CACHE, "key", None)
+
+    (tmp_path / "state").mkdir()
+    (tmp_path / "state" / "cognition_state.json").write_text(json.dumps({
+        "perception": {"inputs": [], "signals": []},
+        "state_mutations": {"action_log": [{"n": 0}, {"n": 1}]},
+    }))
+    yield tmp_path
+    state_db.close()
+
+
+def _log():
+    return [e["n"] for e in state_manager.load_state()["state_mutations"]["action_log"]]
+
+
+def test_migrates_json_entries_once(db_state):
+    assert _log() == [0, 1]
+    on_disk = json.loads((db_state / "state" / "cognition_state.json").read_text())
+    assert on_disk["state_mutations"]["action_log"] == []
+
+
+def test_save_keeps_rows_appended_by_another_writer(db_state):
+    state = state_manager.load_state()
+
+    other = sqlite3.connect(db_state / "state" / "cognition.db")
+    with other:
+        other.execute("INSERT INTO action_log (payload) VALUES (?)", (orjson.dumps({"n": "other"}),))
+    other.close()
+
+    state["state_mutations"]["action_log"].append({"n": "mine"})
+    state_manager.save_state(state)
+    state_manager.save_state(state)  # saving the same state again adds nothing
+
+    assert _log() == [0, 1, "other", "mine"]
+
+
+def test_removing_entries_fails_without_writing(db_state):
+    state = state_manager.load_state()
+    state["state_mutations"]["action_log"].pop()
+
+    with pytest.raises(RuntimeError):
+        state_manager.save_state(state)
+    assert _log() == [0, 1]
+
+
+def test_entries_written_with_the_store_off_fail_loudly(db_state):
+    assert _log() == [0, 1]
+
+    path = db_state / "state" / "cognition_state.json"
+    on_disk = json.loads(path.read_text())
+    on_disk["state_mutations"]["action_log"].append({"n": "flag off"})
+    path.write_text(json.dumps(on_disk))
+
+    with pytest.raises(RuntimeError):
+        state_manager.load_state()
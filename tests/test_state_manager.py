@@ -0,0 +1,69 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from engine import state_manager  # noqa: E402
+
+
+@pytest.fixture
+def state_file(tmp_path, monkeypatch):
+    # state_manager resolves state/ against the working directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(state_manager._CACHE, "key", None)
+
+    path = tmp_path / "state" / "cognition_state.json"
+    path.parent.mkdir()
+    path.write_text(json.dumps({
+        "advisories": {
+            "open": [{"id": "adv-1"}],
+            "resolved": [{"id": "adv-2"}],
+            "dismissed": [],
+        },
+    }))
+    return path
+
+
+def test_list_advisories_migrate_to_by_id(state_file):
+    by_id = state_manager.load_state()["advisories"]["by_id"]
+    assert by_id == {
+        "adv-1": {"id": "adv-1", "status": "open"},
+        "adv-2": {"id": "adv-2", "status": "resolved"},
+    }
+
+    # Saved in the new layout only
+    with state_manager.state_transaction():
+        pass
+    on_disk = json.loads(state_file.read_text())["advisories"]
+    assert set(on_disk) == {"by_id"}
+    assert state_manager.get_advisories()["resolved"] == [{"id": "adv-2", "status": "resolved"}]
+
+
+def test_transaction_rolls_back_on_error(state_file):
+    before = state_file.read_bytes()
+
+    with pytest.raises(RuntimeError):
+        with state_manager.state_transaction() as state:
+            state["focus"]["active_project_id"] = "proj-1"
+            raise RuntimeError("boom")
+
+    assert state_file.read_bytes() == before
+    assert state_manager.get_active_project_id() is None
+
+    # The lock was released: the next transaction goes through
+    with state_manager.state_transaction() as state:
+        state["focus"]["active_project_id"] = "proj-2"
+    assert state_manager.get_active_project_id() == "proj-2"
+
+
+def test_nested_transaction_saves_once_with_the_outer(state_file):
+    with state_manager.state_transaction() as outer:
+        with state_manager.state_transaction() as inner:
+            assert inner is outer
+            inner["focus"]["active_project_id"] = "proj-1"
+        assert json.loads(state_file.read_text()).get("focus") is None
+
+    assert state_manager.get_active_project_id() == "proj-1"
@@ -4,16 +4,27 @@ import os
 import re
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
 
 LMSTUDIO_BASE_URL = os.getenv("LMSTUDIO_BASE_URL", "http://localhost:1234/v1")
 LMSTUDIO_API_KEY = os.getenv("LMSTUDIO_API_KEY", "lmstudio")
 DEFAULT_MODEL = os.getenv("LMSTUDIO_MODEL", "qwen2.5-coder-14b-instruct-mlx")
 
+# Keep-alive connections to LM Studio, reused across calls in one process
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=0))
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=0))
+
+# Characters not allowed in a patch filename slug
+_SLUG_RE = re.compile(r"[^a-zA-Z0-9_-]+")
+
 
 def run(cmd: List[str], cwd: Optional[str] = None) -> str:
     p = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True)
@@ -35,16 +46,36 @@ def git_ls_files(root: str) -> List[str]:
     return [line.strip() for line in out.splitlines() if line.strip()]
 
 
+def _decode(raw: bytes) -> str:
+    # Same result as read_text(): lenient UTF-8, universal newlines
+    return raw.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+
+
 def read_text(path: Path, max_chars: int) -> str:
-    data = path.read_text(encoding="utf-8", errors="replace")
-    if len(data) <= max_chars:
-        return data
+    head_chars = max_chars // 2
+    tail_chars = -(-max_chars // 2)
+
+    # A character takes at most 4 bytes, so larger files are certainly
+    # truncated and only the two windows need reading (+4 absorbs a
+    # character split at the window edge)
+    window = 4 * tail_chars + 4
+    if path.stat().st_size <= 2 * window:
+        data = path.read_text(encoding="utf-8", errors="replace")
+        if len(data) <= max_chars:
+            return data
+        head = data[:head_chars]
+        tail = data[-tail_chars:]
+    else:
+        with path.open("rb") as f:
+            head = _decode(f.read(window))[:head_chars]
+            f.seek(-window, os.SEEK_END)
+            tail = _decode(f.read(window))[-tail_chars:]
+
     # Keep head+tail to preserve definitions and endings
-    head = data[: max_chars // 2]
-    tail = data[-max_chars // 2 :]
     return head + "\n\n# ... (truncated) ...\n\n" + tail
 
 
+@lru_cache(maxsize=4)
 def load_contract(root: str) -> str:
     p = Path(root) / "AI_CONTRACT.md"
     if p.exists():
@@ -60,6 +91,16 @@ def load_contract(root: str) -> str:
     ).strip()
 
 
+def file_block(root_path: Path, rel: str, max_file_chars: int) -> str:
+    fp = root_path / rel
+    if not fp.exists():
+        return f"## FILE: {rel}\n# ERROR: file not found\n"
+    if fp.is_dir():
+        return f"## FILE: {rel}\n# ERROR: is a directory\n"
+    content = read_text(fp, max_chars=max_file_chars)
+    return f"## FILE: {rel}\n```text\n{content}\n```"
+
+
 def build_prompt(root: str, task: str, files: List[str], max_file_chars: int) -> str:
     root_path = Path(root)
     blocks = []
@@ -71,16 +112,10 @@ def build_prompt(root: str, task: str, files: List[str], max_file_chars: int) ->
 
     blocks.append("## FILES_PROVIDED\n" + "\n".join(files) if files else "## FILES_PROVIDED\n(none)")
 
-    for rel in files:
-        fp = root_path / rel
-        if not fp.exists():
-            blocks.append(f"## FILE: {rel}\n# ERROR: file not found\n")
-            continue
-        if fp.is_dir():
-            blocks.append(f"## FILE: {rel}\n# ERROR: is a directory\n")
-            continue
-        content = read_text(fp, max_chars=max_file_chars)
-        blocks.append(f"## FILE: {rel}\n```text\n{content}\n```")
+    # Overlap the file reads; map() keeps the blocks in --files order
+    if files:
+        with ThreadPoolExecutor(max_workers=min(16, len(files))) as ex:
+            blocks.extend(ex.map(lambda rel: file_block(root_path, rel, max_file_chars), files))
 
     blocks.append(
         "## OUTPUT_REQUIREMENTS\n"
@@ -96,11 +131,10 @@ def build_prompt(root: str, task: str, files: List[str], max_file_chars: int) ->
 def is_unified_diff(text: str) -> bool:
     t = text.lstrip()
     # Accept common unified diff / git diff formats
-    return (
-        t.startswith("diff --git ")
-        or (("--- " in t) and ("+++ " in t) and ("@@ " in t))
-        or (t.startswith("--- ") and "+++ " in t)
-    )
+    if t.startswith("diff --git "):
+        return True
+    # Both remaining forms need a +++ header; test it once, cheapest first
+    return "+++ " in t and (t.startswith("--- ") or ("--- " in t and "@@ " in t))
 
 
 def call_lmstudio(system: str, user: str, model: str) -> str:
@@ -114,7 +148,7 @@ def call_lmstudio(system: str, user: str, model: str) -> str:
             {"role": "user", "content": user},
         ],
     }
-    r = requests.post(url, headers=headers, json=payload, timeout=300)
+    r = _SESSION.post(url, headers=headers, json=payload, timeout=300)
     r.raise_for_status()
     data = r.json()
     return data["choices"][0]["message"]["content"]
@@ -122,7 +156,7 @@ def call_lmstudio(system: str, user: str, model: str) -> str:
 
 def save_patch(root: str, patch_text: str, slug: str) -> Path:
     ts = dt.datetime.now().strftime("%Y%m%d_%H%M%S")
-    safe = re.sub(r"[^a-zA-Z0-9_-]+", "-", slug)[:60].strip("-") or "patch"
+    safe = _SLUG_RE.sub("-", slug)[:60].strip("-") or "patch"
     out_dir = Path(root) / ".local_assistant" / "patches"
     out_dir.mkdir(parents=True, exist_ok=True)
     p = out_dir / f"{ts}_{safe}.patch"
@@ -1,28 +1,76 @@
+import asyncio
+import functools
+import gzip
+import hashlib
 import os
+import random
+import re
+import sqlite3
 import subprocess
+import tempfile
 import threading
-import time
 import uuid
-from dataclasses import dataclass, asdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, fields
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
-import requests
+import httpx
+import orjson
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
 
 
-REPO_ROOT = Path(subprocess.check_output(["git", "rev-parse", "--show-toplevel"], text=True).strip())
+@functools.cache
+def repo_root() -> Path:
+    """
+    The repository patches are applied to: $REPO_ROOT if set, otherwise
+    asked of git on first use rather than at import.
+    """
+    root = os.getenv("REPO_ROOT")
+    if root:
+        return Path(root).resolve()
+    return Path(subprocess.check_output(["git", "rev-parse", "--show-toplevel"], text=True).strip())
+
 
 LM_BASE_URL = os.getenv("LMSTUDIO_BASE_URL", "http://localhost:1234/v1")
 LM_API_KEY = os.getenv("LMSTUDIO_API_KEY", "lmstudio")
 LM_MODEL = os.getenv("LMSTUDIO_MODEL", "qwen2.5-coder-14b-instruct-mlx")
 
 MAX_ATTEMPTS = int(os.getenv("LOCAL_CLAUDE_MAX_ATTEMPTS", "6"))
-
-
-@dataclass
+# Longest LM Studio may go without sending anything (prompt processing
+# included) before the call counts as stalled and is retried. Applies to
+# the gaps in the stream, not its total length, so a long generation that
+# keeps streaming is never cut off.
+LLM_TIMEOUT = float(os.getenv("LOCAL_CLAUDE_LLM_TIMEOUT", "300"))
+# Transport-level retries per call, separate from MAX_ATTEMPTS
+LLM_RETRIES = int(os.getenv("LOCAL_CLAUDE_LLM_RETRIES", "2"))
+# Agent A candidates sampled per call with "n"; needs a server that
+# supports n > 1, so it is off by default.
+AGENT_A_SAMPLES = int(os.getenv("LOCAL_CLAUDE_SAMPLES", "1"))
+# Jobs worked on at once; the rest stay queued
+JOB_CONCURRENCY = int(os.getenv("LOCAL_CLAUDE_CONCURRENCY", "4"))
+# Upper bound on concurrent LM Studio requests across all jobs
+MAX_INFLIGHT = int(os.getenv("LOCAL_CLAUDE_MAX_INFLIGHT", "4"))
+
+# The UI ships next to this package, so it does not depend on repo_root()
+WEB_DIR = Path(__file__).resolve().parent.parent / "web"
+STATIC_DIR = WEB_DIR / "static"
+INDEX_PATH = WEB_DIR / "templates" / "index.html"
+# Re-read index.html when it changes on disk
+DEBUG = os.getenv("LOCAL_CLAUDE_DEBUG", "0") == "1"
+
+# Jobs survive restarts in this SQLite file. The default is one file per
+# target repo under the user's state dir, never inside the repo itself.
+DB_PATH = os.getenv("LOCAL_CLAUDE_DB")
+STATE_HOME = Path(os.getenv("XDG_STATE_HOME") or Path.home() / ".local" / "state")
+# Updates to the same job within this window become one write
+FLUSH_DELAY = 0.05
+
+
+@dataclass(slots=True)
 class Job:
     id: str
     prompt: str
@@ -33,14 +81,105 @@ class Job:
     patch: str
 
 
+# Only touched from the event loop, so updates between awaits are atomic.
 JOBS: Dict[str, Job] = {}
-LOCK = threading.Lock()
+
+# Job id -> its running task. Held here because the event loop only keeps
+# weak references, and so rejecting a job can cancel it.
+TASKS: Dict[str, asyncio.Task] = {}
+# One queue of changed job ids per open /api/jobs/stream connection
+SUBSCRIBERS: Set[asyncio.Queue] = set()
+
+CLIENT: Optional[httpx.AsyncClient] = None
+JOB_SEM = asyncio.Semaphore(JOB_CONCURRENCY)
+LLM_SEM = asyncio.Semaphore(MAX_INFLIGHT)
+
+
+# ─────────────────────────────────────────────
+# Job store
+# ─────────────────────────────────────────────
+
+DB: Optional[sqlite3.Connection] = None
+DB_LOCK = threading.Lock()
+# Ids of jobs changed since the last flush
+WRITES: Optional[asyncio.Queue] = None
+
+
+def _db_path() -> Path:
+    if DB_PATH:
+        return Path(DB_PATH)
+    repo_key = hashlib.blake2b(str(repo_root()).encode(), digest_size=8).hexdigest()
+    return STATE_HOME / "local_claude_ui" / f"jobs-{repo_key}.db"
+
+
+def _db_open() -> sqlite3.Connection:
+    path = _db_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, payload BLOB NOT NULL)")
+    return conn
+
+
+def _db_load() -> Dict[str, Job]:
+    jobs = {}
+    with DB_LOCK:
+        for (payload,) in DB.execute("SELECT payload FROM jobs ORDER BY rowid"):
+            job = Job(**orjson.loads(payload))
+            # Whatever was in flight died with the previous process
+            if job.status in ("queued", "running"):
+                job.status = "failed"
+                job.last_error = "interrupted by server restart"
+            jobs[job.id] = job
+    return jobs
+
+
+def _db_write(rows: list) -> None:
+    # Autocommit connection: without an explicit transaction every row
+    # would commit on its own
+    with DB_LOCK:
+        DB.execute("BEGIN")
+        try:
+            DB.executemany(
+                "INSERT INTO jobs (id, payload) VALUES (?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET payload = excluded.payload",
+                rows,
+            )
+        except BaseException:
+            DB.execute("ROLLBACK")
+            raise
+        DB.execute("COMMIT")
+
+
+def _touch(job: Job) -> None:
+    """
+    Mark a job as changed; the writer task persists it shortly and open
+    event streams push it to the UI.
+    """
+    if WRITES is not None:
+        WRITES.put_nowait(job.id)
+    for queue in SUBSCRIBERS:
+        queue.put_nowait(job.id)
 
 
+async def _writer() -> None:
+    while True:
+        # dict rather than set so new jobs are inserted in creation order
+        ids = {await WRITES.get(): None}
+        await asyncio.sleep(FLUSH_DELAY)
+        while not WRITES.empty():
+            ids[WRITES.get_nowait()] = None
+        # Serialize here so a row never mixes fields from two updates
+        rows = [(i, orjson.dumps(JOBS[i])) for i in ids if i in JOBS]
+        await asyncio.to_thread(_db_write, rows)
+
+
+@functools.lru_cache(maxsize=1)
 def _read_contract() -> str:
     # Support both names
     for name in ["AI_CONTRACT.md", "ai_contract.md"]:
-        p = REPO_ROOT / name
+        p = repo_root() / name
         if p.exists():
             return p.read_text(encoding="utf-8", errors="replace").strip()
     return (
@@ -52,34 +191,107 @@ def _read_contract() -> str:
     ).strip()
 
 
-def _call_llm(system: str, user: str) -> str:
-    url = f"{LM_BASE_URL}/chat/completions"
-    headers = {"Authorization": f"Bearer {LM_API_KEY}"}
+async def _call_llm(
+    system: str,
+    user: str,
+    on_line: Optional[Callable[[str], None]] = None,
+) -> str:
+    """
+    Stream a chat completion and return the full text.
+    on_line, if given, is called with the text so far each time a line completes.
+    """
+    return (await _request(system, user, on_line, 1))[0]
+
+
+async def _sample_llm(system: str, user: str, n: int) -> List[str]:
+    """
+    Sample n completions of the same prompt in one request.
+    """
+    return await _request(system, user, None, n)
+
+
+async def _request(
+    system: str,
+    user: str,
+    on_line: Optional[Callable[[str], None]],
+    n: int,
+) -> List[str]:
+    # Timeouts and connection errors are retried LLM_RETRIES times
+    for retry in range(LLM_RETRIES + 1):
+        try:
+            async with LLM_SEM:
+                return await _complete(system, user, on_line, n)
+        except httpx.ReadTimeout:
+            if retry == LLM_RETRIES:
+                raise TimeoutError(f"LM Studio sent nothing for {LLM_TIMEOUT:g}s")
+        except httpx.TransportError:
+            if retry == LLM_RETRIES:
+                raise
+        await asyncio.sleep(0.5 * 2 ** retry + random.uniform(0, 0.5))
+
+
+async def _complete(
+    system: str,
+    user: str,
+    on_line: Optional[Callable[[str], None]],
+    n: int,
+) -> List[str]:
     payload = {
         "model": LM_MODEL,
         "temperature": 0.2,
+        "stream": True,
         "messages": [
             {"role": "system", "content": system},
             {"role": "user", "content": user},
         ],
     }
-    r = requests.post(url, headers=headers, json=payload, timeout=300)
-    r.raise_for_status()
-    return r.json()["choices"][0]["message"]["content"]
+    if n > 1:
+        payload["n"] = n
+    parts = [[] for _ in range(n)]
+    async with CLIENT.stream(
+        "POST",
+        "/chat/completions",
+        content=orjson.dumps(payload),
+        headers={"Content-Type": "application/json"},
+    ) as r:
+        r.raise_for_status()
+        async for line in r.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            for choice in orjson.loads(data)["choices"]:
+                delta = choice.get("delta", {}).get("content")
+                if not delta:
+                    continue
+                text = parts[choice.get("index", 0)]
+                text.append(delta)
+                if on_line is not None and "\n" in delta:
+                    on_line("".join(text))
+    return ["".join(text) for text in parts]
+
+
+# Opening fence line, body, optional closing fence line (the last line)
+_FENCE_RE = re.compile(r"\A```[^\n]*(?:\n(.*?))??(?:\n```[^\n]*)?\Z", re.S)
+# Leading "--- <path>" / "+++ <path>" pair without a diff --git line
+_HDR_RE = re.compile(r"\A--- ([^\n]*)\n\+\+\+ [^\n]*(?=\n|\Z)")
 
 
 def _strip_markdown_fences(text: str) -> str:
     t = text.strip()
-    if t.startswith("```"):
-        lines = t.splitlines()
-        if lines and lines[0].startswith("```"):
-            lines = lines[1:]
-        if lines and lines[-1].startswith("```"):
-            lines = lines[:-1]
-        return "\n".join(lines).strip()
+    m = _FENCE_RE.match(t)
+    if m:
+        return (m.group(1) or "").strip()
     return t
 
 
+def _git_header(m: re.Match) -> str:
+    # Prefer the old path for both sides, rewritten to a/ b/
+    path = m.group(1).strip()
+    return f"diff --git a/{path} b/{path}\n--- a/{path}\n+++ b/{path}"
+
+
 def _ensure_git_headers(patch: str) -> str:
     """
     Normalize common LLM diff output into git-apply friendly format.
@@ -87,85 +299,189 @@ def _ensure_git_headers(patch: str) -> str:
     - Ensures diff --git a/ b/ headers exist when possible
     """
     patch = _strip_markdown_fences(patch)
-    lines = patch.splitlines()
-
-    if not lines:
-        return ""
 
     # If it already starts with diff --git, trust it.
-    if lines[0].startswith("diff --git "):
-        return patch.strip()
+    if patch.startswith("diff --git "):
+        return patch
 
     # If it starts with --- <path> / +++ <path>, inject diff --git + a/ b/
-    if lines[0].startswith("--- ") and len(lines) > 1 and lines[1].startswith("+++ "):
-        oldp = lines[0].replace("--- ", "").strip()
-        newp = lines[1].replace("+++ ", "").strip()
+    return _HDR_RE.sub(_git_header, patch, count=1)
+
 
-        # Prefer same path; otherwise keep oldp for header
-        path = oldp if oldp == newp else oldp
+async def _git(args: list, patch: bytes) -> Tuple[int, bytes]:
+    proc = await asyncio.create_subprocess_exec(
+        "git", *args,
+        cwd=str(repo_root()),
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    out, err = await proc.communicate(patch)
+    return proc.returncode, err or out
 
-        # Rewrite headers to a/ b/
-        lines[0] = f"--- a/{path}"
-        lines[1] = f"+++ b/{path}"
-        lines.insert(0, f"diff --git a/{path} b/{path}")
-        return "\n".join(lines).strip()
 
-    return patch.strip()
+# Something git could read as a patch: a git header or a hunk header
+_PATCH_HINT_RE = re.compile(rb"^(?:diff --git |@@ -\d)", re.M)
 
 
-def _git_apply_check(patch_text: str) -> Optional[str]:
-    p = subprocess.run(
-        ["git", "apply", "--check", "--whitespace=nowarn", "-"],
-        cwd=str(REPO_ROOT),
-        input=patch_text,
-        text=True,
-        capture_output=True,
-    )
-    if p.returncode == 0:
+async def _git_apply_check(patch: bytes) -> Optional[str]:
+    # Prose or an empty reply can be rejected without starting git
+    if not _PATCH_HINT_RE.search(patch):
+        return "not a unified diff: no diff --git or @@ hunk header found"
+    code, output = await _git(["apply", "--check", "--whitespace=nowarn", "-"], patch)
+    if code == 0:
         return None
-    return (p.stderr or p.stdout or "git apply --check failed").strip()
+    return (output.decode("utf-8", errors="replace") or "git apply --check failed").strip()
 
 
-def _git_apply(patch_text: str) -> Optional[str]:
-    p = subprocess.run(
-        ["git", "apply", "--whitespace=nowarn", "-"],
-        cwd=str(REPO_ROOT),
-        input=patch_text,
-        text=True,
-        capture_output=True,
-    )
-    if p.returncode == 0:
+async def _git_apply(patch: bytes) -> Optional[str]:
+    code, output = await _git(["apply", "--whitespace=nowarn", "-"], patch)
+    if code == 0:
         return None
-    return (p.stderr or p.stdout or "git apply failed").strip()
+    return (output.decode("utf-8", errors="replace") or "git apply failed").strip()
+
+
+@functools.lru_cache(maxsize=64)
+def _read_file(path: str, mtime_ns: int) -> bytes:
+    # mtime_ns is part of the cache key so edits are picked up
+    return Path(path).read_bytes()
 
 
 def _build_context(files_csv: str) -> str:
     files = [f.strip() for f in files_csv.split(",") if f.strip()]
     blocks = []
-    blocks.append(f"REPO_ROOT: {REPO_ROOT}")
+    blocks.append(f"REPO_ROOT: {repo_root()}")
     blocks.append("FILES_PROVIDED:\n" + "\n".join(files))
 
     for rel in files:
-        fp = REPO_ROOT / rel
+        fp = repo_root() / rel
         if not fp.exists() or fp.is_dir():
             blocks.append(f"\nFILE: {rel}\nERROR: not found or is directory\n")
             continue
-        content = fp.read_text(encoding="utf-8", errors="replace")
-        # keep it reasonable; local models drift with huge context
-        if len(content) > 18000:
-            content = content[:9000] + "\n\n# ...TRUNCATED...\n\n" + content[-9000:]
+        data = _read_file(str(fp), fp.stat().st_mtime_ns)
+        # keep it reasonable; local models drift with huge context.
+        # Slice the bytes so the dropped middle is never decoded.
+        if len(data) > 18000:
+            content = (
+                data[:9000].decode("utf-8", errors="replace")
+                + "\n\n# ...TRUNCATED...\n\n"
+                + data[-9000:].decode("utf-8", errors="replace")
+            )
+        else:
+            content = data.decode("utf-8", errors="replace")
         blocks.append(f"\nFILE: {rel}\n```text\n{content}\n```")
 
     return "\n".join(blocks)
 
 
-def _agent_a_prompt(user_prompt: str, files_csv: str) -> str:
-    ctx = _build_context(files_csv)
+# Lines of file context kept around each hunk for Agent B
+HUNK_MARGIN = 20
+
+# Old-side start line of a hunk header
+_HUNK_RE = re.compile(r"^@@ -(\d+)")
+
+
+def _patch_hunks(patch: str) -> Dict[str, list]:
+    """
+    {path: [(claimed start line, old-side lines), ...]} for each hunk.
+    """
+    hunks: Dict[str, list] = {}
+    path = None
+    old = None
+    lines = patch.splitlines()
+    for i, line in enumerate(lines):
+        m = _HUNK_RE.match(line)
+        if line.startswith("diff --git ") or (
+            line.startswith("--- ") and i + 1 < len(lines) and lines[i + 1].startswith("+++ ")
+        ):
+            old = None
+        elif line.startswith("+++ "):
+            path = line[4:].strip()
+            path = path[2:] if path.startswith("b/") else path
+            old = None
+        elif m and path is not None:
+            old = []
+            hunks.setdefault(path, []).append((int(m.group(1)), old))
+        elif old is not None and line[:1] in (" ", "-", ""):
+            # Models often drop the space of a blank context line
+            old.append(line[1:])
+    return hunks
+
+
+def _anchor(index: Dict[str, list], claimed: int, old: list) -> Optional[int]:
+    """
+    0-based line where a hunk's old side actually sits: the offset most of
+    its non-blank lines agree on, nearest the claimed start on a tie.
+    None if none of those lines occur in the file.
+    """
+    votes: Dict[int, int] = {}
+    for k, text in enumerate(old):
+        for i in index.get(text.strip(), ()) if text.strip() else ():
+            votes[i - k] = votes.get(i - k, 0) + 1
+    if not votes:
+        return None
+    return max(votes, key=lambda start: (votes[start], -abs(start - (claimed - 1))))
+
+
+def _hunk_context(patch: str) -> str:
+    """
+    Only the lines around each hunk of a patch, or "" when the full
+    context is needed instead. Agent B is fixing a patch, not writing one,
+    so this is usually all it needs and far shorter than the full context.
+
+    A bad patch's line numbers are often what is wrong with it, so each
+    window is placed where the hunk's context and removed lines are found
+    in the file, not where its header claims. If any hunk's lines are not
+    in the file at all, there is nothing to anchor on and "" is returned.
+    """
+    blocks = []
+    for rel, hunks in _patch_hunks(patch).items():
+        fp = (repo_root() / rel).resolve()
+        if repo_root() not in fp.parents or not fp.is_file():
+            continue
+        lines = _read_file(str(fp), fp.stat().st_mtime_ns).decode("utf-8", errors="replace").splitlines()
+
+        index: Dict[str, list] = {}
+        for i, line in enumerate(lines):
+            if line.strip():
+                index.setdefault(line.strip(), []).append(i)
+
+        spans = []
+        for claimed, old in hunks:
+            if not any(t.strip() for t in old):
+                # Pure addition: only the header says where it goes
+                start = claimed - 1
+            else:
+                start = _anchor(index, claimed, old)
+                if start is None:
+                    return ""
+            spans.append((max(1, start + 1 - HUNK_MARGIN), start + len(old) + HUNK_MARGIN))
+
+        # Merge overlapping windows so no line is sent twice
+        merged = []
+        for a, b in sorted(spans):
+            if merged and a <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], b)
+            else:
+                merged.append([a, b])
+
+        for a, b in merged:
+            b = min(b, len(lines))
+            body = "\n".join(lines[a - 1:b])
+            blocks.append(f"\nFILE: {rel}\nRELEVANT LINES [{a}-{b}]:\n```text\n{body}\n```")
+
+    if not blocks:
+        return ""
+    return f"REPO_ROOT: {repo_root()}\n" + "\n".join(blocks)
+
+
+def _agent_a_prompt(user_prompt: str, ctx: str) -> str:
     return f"{ctx}\n\nTASK:\n{user_prompt}\n\nOUTPUT: git-style unified diff ONLY."
 
 
-def _agent_b_prompt(user_prompt: str, files_csv: str, bad_patch: str, err: str) -> str:
-    ctx = _build_context(files_csv)
+def _agent_b_prompt(user_prompt: str, ctx: str, bad_patch: str, err: str) -> str:
+    # Full context only when the patch gives nothing to anchor on
+    ctx = _hunk_context(bad_patch) or ctx
     return (
         f"{ctx}\n\nTASK:\n{user_prompt}\n\n"
         f"BAD_PATCH:\n{bad_patch}\n\n"
@@ -175,11 +491,52 @@ def _agent_b_prompt(user_prompt: str, files_csv: str, bad_patch: str, err: str)
     )
 
 
-def _run_job(job_id: str) -> None:
-    with LOCK:
-        job = JOBS[job_id]
-        job.status = "running"
-        JOBS[job_id] = job
+async def _propose(system: str, user: str) -> Tuple[str, Optional[str]]:
+    # Validate the patch while it is still streaming. Models usually end
+    # with a closing fence or blank lines, which normalize away, so the
+    # last check started often already covers the final patch.
+    spec = None  # (patch, check task)
+
+    def on_line(text: str) -> None:
+        nonlocal spec
+        if spec is not None and not spec[1].done():
+            return
+        patch = _ensure_git_headers(text[:text.rfind("\n") + 1])
+        if "\n@@ " not in patch or (spec is not None and spec[0] == patch):
+            return
+        spec = (patch, asyncio.create_task(_git_apply_check(patch.encode("utf-8"))))
+
+    try:
+        raw = await _call_llm(system=system, user=user, on_line=on_line)
+        patch = _ensure_git_headers(raw)
+        if spec is not None and spec[0] == patch:
+            return patch, await spec[1]
+        return patch, await _git_apply_check(patch.encode("utf-8"))
+    finally:
+        if spec is not None:
+            spec[1].cancel()
+
+
+async def _propose_sampled(system: str, user: str) -> Tuple[str, Optional[str]]:
+    texts = await _sample_llm(system, user, AGENT_A_SAMPLES)
+    # Identical samples only need one check
+    patches = list(dict.fromkeys(_ensure_git_headers(t) for t in texts))
+    errs = await asyncio.gather(*(_git_apply_check(p.encode("utf-8")) for p in patches))
+    for patch, err in zip(patches, errs):
+        if err is None:
+            return patch, None
+    return patches[0], errs[0]
+
+
+async def _run_job(job_id: str) -> None:
+    async with JOB_SEM:
+        await _process_job(job_id)
+
+
+async def _process_job(job_id: str) -> None:
+    job = JOBS[job_id]
+    job.status = "running"
+    _touch(job)
 
     contract = _read_contract()
 
@@ -194,83 +551,248 @@ def _run_job(job_id: str) -> None:
         "Return PATCH ONLY.\n"
     )
 
-    for attempt in range(1, MAX_ATTEMPTS + 1):
-        with LOCK:
-            job = JOBS[job_id]
+    ctx = _build_context(job.files)
+
+    # (patch, error) of the most recent candidate that failed validation
+    last = None
+
+    # One round past MAX_ATTEMPTS repairs the candidate that failed last,
+    # so every failed candidate gets its Agent B pass
+    for attempt in range(1, MAX_ATTEMPTS + 2):
+        repair_only = attempt > MAX_ATTEMPTS
+        if repair_only and last is None:
+            break
+
+        pending = []
+        if not repair_only:
             job.attempt = attempt
-            JOBS[job_id] = job
+            _touch(job)
+
+            # Agent A proposes. Once a candidate has failed, Agent B repairs
+            # it in parallel instead of waiting for A's next proposal to fail.
+            propose_a = _propose_sampled if AGENT_A_SAMPLES > 1 else _propose
+            pending.append(asyncio.create_task(propose_a(system_a, _agent_a_prompt(job.prompt, ctx))))
+        if last is not None:
+            user_b = _agent_b_prompt(job.prompt, ctx, *last)
+            pending.append(asyncio.create_task(_propose(system_b, user_b)))
 
         try:
-            # Agent A proposes
-            user_a = _agent_a_prompt(job.prompt, job.files)
-            raw = _call_llm(system=system_a, user=user_a)
-            patch = _ensure_git_headers(raw)
-
-            err = _git_apply_check(patch)
-            if err is None:
-                with LOCK:
-                    job = JOBS[job_id]
+            for fut in asyncio.as_completed(pending):
+                try:
+                    patch, err = await fut
+                except Exception as e:
+                    job.last_error = str(e)
+                    _touch(job)
+                    continue
+
+                if err is None:
                     job.patch = patch
                     job.last_error = ""
                     job.status = "needs_review"
-                    JOBS[job_id] = job
-                return
-
-            # Agent B tries to repair
-            user_b = _agent_b_prompt(job.prompt, job.files, patch, err)
-            raw2 = _call_llm(system=system_b, user=user_b)
-            patch2 = _ensure_git_headers(raw2)
-
-            err2 = _git_apply_check(patch2)
-            if err2 is None:
-                with LOCK:
-                    job = JOBS[job_id]
-                    job.patch = patch2
-                    job.last_error = ""
-                    job.status = "needs_review"
-                    JOBS[job_id] = job
-                return
+                    _touch(job)
+                    return
 
-            with LOCK:
-                job = JOBS[job_id]
-                job.last_error = err2
-                job.patch = patch2
-                JOBS[job_id] = job
+                last = (patch, err)
+                job.last_error = err
+                job.patch = patch
+                _touch(job)
+        finally:
+            # Also runs when the job is rejected: its Agent A/B calls
+            # stop and give back their LLM_SEM slots
+            for t in pending:
+                t.cancel()
 
-        except Exception as e:
-            with LOCK:
-                job = JOBS[job_id]
-                job.last_error = str(e)
-                JOBS[job_id] = job
+        # Back off 100ms, 200ms, ... up to 2s between A's attempts
+        if attempt < MAX_ATTEMPTS:
+            await asyncio.sleep(min(2.0, 0.1 * 2 ** (attempt - 1)))
 
-        time.sleep(0.5)
+    job.status = "failed"
+    _touch(job)
 
-    with LOCK:
-        job = JOBS[job_id]
-        job.status = "failed"
-        JOBS[job_id] = job
 
+# ─────────────────────────────────────────────
+# Static assets
+# ─────────────────────────────────────────────
+
+INDEX_HTML = INDEX_PATH.read_text(encoding="utf-8")
+INDEX_MTIME = INDEX_PATH.stat().st_mtime_ns
+
+
+def _index_html() -> str:
+    global INDEX_HTML, INDEX_MTIME
+    if DEBUG:
+        mtime = INDEX_PATH.stat().st_mtime_ns
+        if mtime != INDEX_MTIME:
+            INDEX_HTML = INDEX_PATH.read_text(encoding="utf-8")
+            INDEX_MTIME = mtime
+    return INDEX_HTML
+
+
+# gzip copies of the static assets, written at startup. Kept in the temp
+# dir: never inside the repository patches are applied to.
+STATIC_GZ_DIR = Path(tempfile.gettempdir()) / "local_claude_ui" / "static"
+
+
+def _gz_path(src: Path) -> Path:
+    return STATIC_GZ_DIR / (str(src.relative_to(STATIC_DIR)) + ".gz")
+
+
+def _precompress_static() -> None:
+    """
+    Write a .gz copy of every static asset that is missing or stale, so
+    requests are served straight from disk instead of compressed per hit.
+    """
+    for src in STATIC_DIR.rglob("*"):
+        if not src.is_file():
+            continue
+        dst = _gz_path(src)
+        if dst.exists() and dst.stat().st_mtime_ns >= src.stat().st_mtime_ns:
+            continue
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        dst.write_bytes(gzip.compress(src.read_bytes(), 9))
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that answers with the precompressed copy when the client
+    accepts gzip. Both go out as FileResponse, so the server can sendfile.
+    A copy older than its source (edited since startup) is ignored.
+    """
+
+    async def get_response(self, path: str, scope) -> Response:
+        response = await super().get_response(path, scope)
+        if response.status_code != 200 or not isinstance(response, FileResponse):
+            return response
+        if "gzip" not in Headers(scope=scope).get("accept-encoding", ""):
+            return response
+
+        gz = _gz_path(Path(response.path))
+        try:
+            if gz.stat().st_mtime_ns < os.stat(response.path).st_mtime_ns:
+                return response
+        except FileNotFoundError:
+            return response
+        return FileResponse(
+            gz,
+            media_type=response.media_type,
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+        )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global CLIENT, DB, WRITES
+    await asyncio.to_thread(_precompress_static)
+    DB = await asyncio.to_thread(_db_open)
+    JOBS.update(await asyncio.to_thread(_db_load))
+    WRITES = asyncio.Queue()
+    writer = asyncio.create_task(_writer())
+
+    # One pooled client for every job so Agent A/B calls reuse the
+    # same keep-alive connections to LM Studio.
+    CLIENT = httpx.AsyncClient(
+        base_url=LM_BASE_URL,
+        timeout=httpx.Timeout(LLM_TIMEOUT, connect=10),
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+        headers={"Authorization": f"Bearer {LM_API_KEY}"},
+    )
+    try:
+        yield
+    finally:
+        await CLIENT.aclose()
+        CLIENT = None
+
+        # Stop the writer and persist everything once more, which also
+        # covers updates still waiting in the queue.
+        writer.cancel()
+        WRITES = None
+        _db_write([(j.id, orjson.dumps(j)) for j in JOBS.values()])
+        DB.close()
+        DB = None
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Serve UI
-app.mount("/static", StaticFiles(directory=str(REPO_ROOT / "tools/local_claude_ui/web/static")), name="static")
+app.mount("/static", PrecompressedStaticFiles(directory=str(STATIC_DIR)), name="static")
 
 
 @app.get("/", response_class=HTMLResponse)
-def index():
-    html = (REPO_ROOT / "tools/local_claude_ui/web/templates/index.html").read_text(encoding="utf-8")
-    return html
+async def index():
+    return _index_html()
+
+
+# ─────────────────────────────────────────────
+# Job events
+# ─────────────────────────────────────────────
+
+JOB_FIELDS = tuple(f.name for f in fields(Job))
+# Comment line sent on idle streams so proxies keep them open
+SSE_PING_SECONDS = 15
+
+
+def _job_fields(job: Job) -> dict:
+    return {name: getattr(job, name) for name in JOB_FIELDS}
+
+
+def _sse(event: str, data) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+async def _job_events():
+    """
+    A "snapshot" event with every job, then one "job" event per change
+    carrying the job id and only the fields that differ from what this
+    client was last sent.
+    """
+    queue = asyncio.Queue()
+    SUBSCRIBERS.add(queue)
+    try:
+        seen = {j.id: _job_fields(j) for j in JOBS.values()}
+        yield _sse("snapshot", {"jobs": list(seen.values())})
+
+        while True:
+            try:
+                ids = {await asyncio.wait_for(queue.get(), SSE_PING_SECONDS): None}
+            except asyncio.TimeoutError:
+                yield b": ping\n\n"
+                continue
+            while not queue.empty():
+                ids[queue.get_nowait()] = None
+
+            for job_id in ids:
+                job = JOBS.get(job_id)
+                if job is None:
+                    continue
+                current = _job_fields(job)
+                previous = seen.get(job_id, {})
+                delta = {k: v for k, v in current.items() if previous.get(k) != v}
+                seen[job_id] = current
+                if delta:
+                    delta["id"] = job_id
+                    yield _sse("job", delta)
+    finally:
+        SUBSCRIBERS.discard(queue)
+
+
+@app.get("/api/jobs/stream")
+async def stream_jobs():
+    return StreamingResponse(
+        _job_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.get("/api/jobs")
-def list_jobs():
-    with LOCK:
-        return {"jobs": [asdict(j) for j in JOBS.values()]}
+async def list_jobs():
+    # orjson serializes the dataclasses directly; returning a response
+    # skips FastAPI's jsonable_encoder copy of every job.
+    return ORJSONResponse({"jobs": list(JOBS.values())})
 
 
 @app.post("/api/jobs")
-def create_job(payload: dict):
+async def create_job(payload: dict):
     prompt = (payload.get("prompt") or "").strip()
     files = (payload.get("files") or "").strip()
 
@@ -289,48 +811,49 @@ def create_job(payload: dict):
         last_error="",
         patch="",
     )
-    with LOCK:
-        JOBS[job_id] = job
+    JOBS[job_id] = job
+    _touch(job)
 
-    t = threading.Thread(target=_run_job, args=(job_id,), daemon=True)
-    t.start()
+    task = asyncio.create_task(_run_job(job_id))
+    TASKS[job_id] = task
+    task.add_done_callback(lambda _: TASKS.pop(job_id, None))
 
     return {"id": job_id}
 
 
 @app.post("/api/jobs/{job_id}/apply")
-def apply_job(job_id: str):
-    with LOCK:
-        if job_id not in JOBS:
-            raise HTTPException(status_code=404, detail="job not found")
-        job = JOBS[job_id]
+async def apply_job(job_id: str):
+    job = JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
 
     if job.status != "needs_review":
         raise HTTPException(status_code=400, detail=f"job not ready (status={job.status})")
 
-    err = _git_apply(job.patch)
+    err = await _git_apply(job.patch.encode("utf-8"))
     if err is not None:
-        with LOCK:
-            job = JOBS[job_id]
-            job.status = "failed"
-            job.last_error = err
-            JOBS[job_id] = job
+        job.status = "failed"
+        job.last_error = err
+        _touch(job)
         raise HTTPException(status_code=400, detail=err)
 
-    with LOCK:
-        job = JOBS[job_id]
-        job.status = "applied"
-        JOBS[job_id] = job
+    job.status = "applied"
+    _touch(job)
 
     return {"ok": True}
 
 
 @app.post("/api/jobs/{job_id}/reject")
-def reject_job(job_id: str):
-    with LOCK:
-        if job_id not in JOBS:
-            raise HTTPException(status_code=404, detail="job not found")
-        job = JOBS[job_id]
-        job.status = "rejected"
-        JOBS[job_id] = job
+async def reject_job(job_id: str):
+    job = JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    job.status = "rejected"
+    _touch(job)
+
+    # Stop the worker wherever it is waiting (queue slot, LLM call or
+    # backoff); cancellation releases the semaphores it holds
+    task = TASKS.pop(job_id, None)
+    if task is not None:
+        task.cancel()
     return {"ok": True}
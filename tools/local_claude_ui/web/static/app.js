@@ -1,16 +1,11 @@
 let selectedJobId = null;
+let jobs = {};
 
-async function fetchJobs() {
-  const r = await fetch('/api/jobs');
-  const data = await r.json();
-  return data.jobs || [];
-}
-
-function renderJobs(jobs) {
+function renderJobs() {
   const el = document.getElementById('jobs');
   el.innerHTML = '';
 
-  jobs
+  Object.values(jobs)
     .sort((a, b) => b.attempt - a.attempt)
     .forEach((j) => {
       const div = document.createElement('div');
@@ -33,10 +28,9 @@ function escapeHtml(s) {
     .replaceAll('>', '&gt;');
 }
 
-async function selectJob(jobId) {
+function selectJob(jobId) {
   selectedJobId = jobId;
-  const jobs = await fetchJobs();
-  const job = jobs.find((j) => j.id === jobId);
+  const job = jobs[jobId];
   if (!job) return;
 
   document.getElementById('meta').textContent =
@@ -50,14 +44,32 @@ async function selectJob(jobId) {
   document.getElementById('reject').disabled = !canReview;
 }
 
-async function refreshLoop() {
-  const jobs = await fetchJobs();
-  renderJobs(jobs);
+function refresh() {
+  renderJobs();
 
   if (selectedJobId) {
-    await selectJob(selectedJobId);
+    selectJob(selectedJobId);
   }
-  setTimeout(refreshLoop, 1000);
+}
+
+// The server sends every job once, then only the fields that change.
+// EventSource reconnects on its own and gets a fresh snapshot.
+function listenJobs() {
+  const source = new EventSource('/api/jobs/stream');
+
+  source.addEventListener('snapshot', (e) => {
+    jobs = {};
+    JSON.parse(e.data).jobs.forEach((j) => {
+      jobs[j.id] = j;
+    });
+    refresh();
+  });
+
+  source.addEventListener('job', (e) => {
+    const change = JSON.parse(e.data);
+    jobs[change.id] = { ...jobs[change.id], ...change };
+    refresh();
+  });
 }
 
 document.getElementById('run').onclick = async () => {
@@ -94,4 +106,4 @@ document.getElementById('reject').onclick = async () => {
   if (!r.ok) alert(await r.text());
 };
 
-refreshLoop();
+listenJobs();
@@ -273,17 +273,35 @@ async function fetchOutputFile(filename) {
   }
 }
 
+/**
+ * Last body and ETag of each batched read, so an unchanged section is
+ * answered with a bodyless 304 instead of being downloaded again
+ */
+const batchCache = {};
+
 /**
  * Load all output files
  */
 async function loadAllData() {
-  const [intel, kb, projects, actionLog, kbDrafts] = await Promise.all([
-    fetch('/api/intel').then((res) => res.json()),
-    fetch('/api/kb').then((res) => res.json()),
-    fetch('/api/projects').then((res) => res.json()),
-    fetch('/api/action-log').then((res) => res.json()),
-    fetch('/api/kb-drafts').then((res) => res.json()),
-  ]);
+  // One round trip for all five reads
+  const paths = ['/api/intel', '/api/kb', '/api/projects', '/api/action-log', '/api/kb-drafts'];
+  const res = await fetch('/api/batch', {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({
+      requests: paths.map((path) => ({ id: path, path, etag: batchCache[path]?.etag })),
+    }),
+  });
+  const { responses } = await res.json();
+
+  responses.forEach((r) => {
+    if (r.status === 200) batchCache[r.id] = { etag: r.etag, body: r.body };
+  });
+
+  // Nothing changed since the last poll
+  if (responses.every((r) => r.status === 304)) return;
+
+  const [intel, kb, projects, actionLog, kbDrafts] = paths.map((path) => batchCache[path]?.body);
 
   // Existing render calls
   state.intelEvents = intel;
@@ -298,7 +316,7 @@ async function loadAllData() {
   renderSystemMetadata();
 
   // NEW
-  renderKBDrafts(kbDrafts.scaffolded || []);
+  renderKBDrafts(kbDrafts?.scaffolded || []);
 }
 
 /* ----------------------------------------------------------------------------